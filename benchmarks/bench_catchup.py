@@ -0,0 +1,100 @@
+"""Measure how long a backlog of missed reminders takes to drain under each catch-up policy.
+
+Writes a store whose pending reminders all fell due over the last two days,
+starts the engine against it with desktop notifications counted in memory
+and email going to a local SMTP sink, and times until every notification
+has been delivered.
+
+Usage: python benchmarks/bench_catchup.py [missed reminders] [recipients]
+"""
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import CATCHUP_POLICIES, JournalTaskStore, ReminderEngine, SMTPConnectionPool, Task
+from smtp_sink import SMTPSink
+
+
+def write_backlog(path, count, recipients):
+    rng = random.Random(0)
+    now = datetime.now()
+    tasks = [Task(
+        id=str(i),
+        title=f"Missed task {i}",
+        description="Fell due while the app was closed",
+        reminder_time=now - timedelta(seconds=rng.uniform(60, 48 * 3600)),
+        email=f"user{i % recipients}@example.com",
+        phone="",
+        recurrence="FREQ=DAILY" if i % 10 == 0 else ""
+    ) for i in range(count)]
+    store = JournalTaskStore(path)
+    store.compact(tasks)
+    store.close()
+
+
+def wait_for_delivery(engine, sink, timeout=300):
+    deadline = time.monotonic() + timeout
+    engine.caught_up.wait(timeout)
+    while time.monotonic() < deadline:
+        stats = engine.dispatcher.metrics()
+        # Empty queues is not enough: a worker may still be mid-send
+        before = sink.messages
+        if all(channel['depth'] == 0 for channel in stats.values()):
+            time.sleep(0.2)
+            if sink.messages == before:
+                return
+        time.sleep(0.05)
+
+
+def run(policy, count, recipients, sink):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        write_backlog(path, count, recipients)
+        popups = []
+        sent_before = sink.messages
+
+        with redirect_stdout(io.StringIO()) as output:
+            engine = ReminderEngine(data_file=path, settings_file=os.path.join(tmp, "email_settings.json"),
+                                    desktop_notifier=popups.append)
+            engine.catchup_policy = policy
+            engine.catchup_max_age = 12.0
+            engine.email_username = "reminders@example.com"
+            engine.email_password = "unused"
+            engine.mail_pool = SMTPConnectionPool("127.0.0.1", sink.port, "", "", use_tls=False)
+
+            start = time.perf_counter()
+            engine.start()
+            wait_for_delivery(engine, sink)
+            elapsed = time.perf_counter() - start
+            engine.stop()
+
+            reloaded = ReminderEngine(data_file=path, settings_file=os.path.join(tmp, "email_settings.json"))
+            overdue = sum(1 for task in reloaded.snapshot()
+                          if task.is_active and not task.is_completed and task.reminder_time <= datetime.now())
+            reloaded.stop()
+
+    report = engine.last_catch_up
+    skipped = sum(entry['action'] == 'skipped' for entry in report)
+    dropped = output.getvalue().count("Dropped ")
+    print(f"  {policy:<9} drained in {elapsed:6.2f}s  {len(report)} missed, {skipped} skipped, "
+          f"{len(popups)} popups, {sink.messages - sent_before} emails, {dropped} dropped, "
+          f"{overdue} still overdue after restart")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    recipients = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    print(f"{count} missed reminders for {recipients} recipients")
+    sink = SMTPSink().start()
+    try:
+        for policy in CATCHUP_POLICIES:
+            run(policy, count, recipients, sink)
+    finally:
+        sink.stop()
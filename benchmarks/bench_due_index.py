@@ -0,0 +1,83 @@
+"""Compare the full-scan reminder check against the DueIndex heap.
+
+Usage: python benchmarks/bench_due_index.py [sizes...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import DueIndex, Task
+
+DUE_PER_TICK = 10
+TICKS = 20
+
+
+def make_tasks(count, now):
+    tasks = []
+    for i in range(count):
+        tasks.append(Task(
+            id=str(i),
+            title=f"Task {i}",
+            description="",
+            reminder_time=now + timedelta(minutes=random.randint(1, 60 * 24 * 30)),
+            email="",
+            phone=""
+        ))
+    # Make a handful of tasks come due on each simulated tick
+    for tick in range(TICKS):
+        for task in random.sample(tasks, DUE_PER_TICK):
+            task.reminder_time = now + timedelta(seconds=tick)
+    return tasks
+
+
+def scan(tasks, now):
+    due = []
+    for task in tasks:
+        if task.is_active and not task.is_completed and task.reminder_time <= now:
+            due.append(task)
+            task.is_completed = True
+    return due
+
+
+def indexed(index, now):
+    due = []
+    for task in index.pop_due(now):
+        if task.is_active and not task.is_completed:
+            due.append(task)
+            task.is_completed = True
+    return due
+
+
+def run(count):
+    random.seed(count)
+    now = datetime.now()
+
+    tasks = make_tasks(count, now)
+    start = time.perf_counter()
+    fired_scan = sum(len(scan(tasks, now + timedelta(seconds=tick))) for tick in range(TICKS))
+    scan_time = (time.perf_counter() - start) / TICKS
+
+    for task in tasks:
+        task.is_completed = False
+    index = DueIndex()
+    start = time.perf_counter()
+    index.rebuild(tasks)
+    build_time = time.perf_counter() - start
+    start = time.perf_counter()
+    fired_index = sum(len(indexed(index, now + timedelta(seconds=tick))) for tick in range(TICKS))
+    index_time = (time.perf_counter() - start) / TICKS
+
+    assert fired_scan == fired_index
+    print(f"{count:>9} tasks  scan {scan_time * 1000:9.3f} ms/tick  "
+          f"index {index_time * 1000:9.3f} ms/tick  "
+          f"(build {build_time * 1000:.1f} ms, speedup {scan_time / max(index_time, 1e-9):.0f}x)")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,125 @@
+"""Compare the memory footprint of task representations with tracemalloc.
+
+Measures a list of the original dict-backed Task dataclass, a list of the
+slotted Task, and a column-per-field layout, each built by streaming the
+same tasks.json snapshot. The columnar layout is measured here only; the
+engine keeps slotted Tasks, which its due index, search index and stores
+all work with.
+
+Usage: python benchmarks/bench_memory.py [sizes...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import iter_json_array, task_from_dict
+
+
+@dataclass
+class DictTask:
+    id: str
+    title: str
+    description: str
+    reminder_time: datetime
+    email: str
+    phone: str
+    is_completed: bool = False
+    is_active: bool = True
+
+
+class ColumnarTasks:
+    """Reminder times as int64 epoch seconds, completed/active flags packed
+    four tasks to a byte, and interned email/phone strings"""
+    COMPLETED = 1
+    ACTIVE = 2
+
+    def __init__(self):
+        self.ids = array('q')
+        self.titles = []
+        self.descriptions = []
+        self.reminder_times = array('q')
+        self.emails = []
+        self.phones = []
+        self.recurrences = []
+        self.flags = bytearray()
+
+    @classmethod
+    def from_json(cls, path):
+        tasks = cls()
+        for task_data in iter_json_array(path):
+            tasks.append(task_data)
+        return tasks
+
+    def append(self, task_data):
+        position = len(self.ids)
+        self.ids.append(int(task_data['id']))
+        self.titles.append(task_data['title'])
+        self.descriptions.append(task_data['description'])
+        self.reminder_times.append(int(datetime.fromisoformat(task_data['reminder_time']).timestamp()))
+        self.emails.append(sys.intern(task_data['email']))
+        self.phones.append(sys.intern(task_data['phone']))
+        self.recurrences.append(sys.intern(task_data.get('recurrence', '')))
+        if position % 4 == 0:
+            self.flags.append(0)
+        value = ((self.COMPLETED if task_data.get('is_completed', False) else 0)
+                 | (self.ACTIVE if task_data.get('is_active', True) else 0))
+        self.flags[position >> 2] |= value << ((position & 3) * 2)
+
+
+def write_snapshot(path, count):
+    start = datetime(2026, 1, 1)
+    with open(path, 'w') as f:
+        f.write("[\n")
+        for i in range(count):
+            if i:
+                f.write(",\n")
+            f.write('{"id": "%d", "title": "Task %d", "description": "Follow up on ticket", '
+                    '"reminder_time": "%s", "email": "user%d@example.com", "phone": "", '
+                    '"is_completed": %s, "is_active": true}'
+                    % (i, i, (start + timedelta(minutes=i)).isoformat(), i % 1000,
+                       "true" if i % 2 else "false"))
+        f.write("\n]\n")
+
+
+def load_dict_tasks(path):
+    return [DictTask(**{**task_data, 'reminder_time': datetime.fromisoformat(task_data['reminder_time'])})
+            for task_data in iter_json_array(path)]
+
+
+def load_slotted_tasks(path):
+    return [task_from_dict(task_data) for task_data in iter_json_array(path)]
+
+
+def measure(label, loader, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = loader(path)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"  {label:<20} retained {current / 2**20:8.1f} MiB  peak {peak / 2**20:8.1f} MiB  "
+          f"load {elapsed:6.2f}s")
+
+
+def run(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        write_snapshot(path, count)
+        print(f"{count} tasks ({os.path.getsize(path) / 2**20:.1f} MiB snapshot)")
+        measure("dataclass + __dict__", load_dict_tasks, path)
+        measure("slotted Task", load_slotted_tasks, path)
+        measure("columnar", ColumnarTasks.from_json, path)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,70 @@
+"""Measure task list refresh latency against task count.
+
+Compares the old clear-and-reinsert refresh with TaskListView's paged,
+diff-based render. Uses a real Treeview when a display is available and
+an in-memory stub otherwise.
+
+Usage: python benchmarks/bench_refresh.py [sizes...]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import Task, TaskListView
+from tk_stub import make_tree
+
+
+def make_tasks(count):
+    now = datetime.now()
+    return [Task(
+        id=str(i),
+        title=f"Task {i}",
+        description="Synthetic benchmark task " * 3,
+        reminder_time=now + timedelta(minutes=i),
+        email="",
+        phone=""
+    ) for i in range(count)]
+
+
+def full_refresh(tree, tasks):
+    for item in tree.get_children():
+        tree.delete(item)
+    for task in tasks:
+        if task.is_active:
+            tree.insert("", "end", values=TaskListView.row_values(task))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(count):
+    tasks = make_tasks(count)
+
+    tree, kind = make_tree()
+    full_first = timed(full_refresh, tree, tasks)
+    tasks[0].is_completed = True
+    full_change = timed(full_refresh, tree, tasks)
+
+    tree, _ = make_tree()
+    view = TaskListView(tree)
+    incremental_first = timed(view.render, tasks)
+    tasks[1].is_completed = True
+    incremental_change = timed(view.render, tasks)
+    tasks[2].is_active = False
+    incremental_remove = timed(view.render, tasks)
+
+    print(f"{count:>8} tasks ({kind})  full: first {full_first:8.1f} ms, one change {full_change:8.1f} ms   "
+          f"paged diff: first {incremental_first:6.1f} ms, one change {incremental_change:6.1f} ms, "
+          f"one removal {incremental_remove:6.1f} ms")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,89 @@
+"""Measure TaskSearchIndex build time and page query latency, checked against a linear scan.
+
+Each query fetches one 200-row page the way the task list does; the full
+result is fetched separately (untimed) to check the page and the scan.
+
+Usage: python benchmarks/bench_search.py [sizes...]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import TaskSearchIndex, due_window
+from workload import generate_tasks
+
+PAGE = 200
+
+
+def scan(tasks, text, start, end):
+    # What filtering looked like without an index: compare every task
+    words = text.casefold().split()
+    matches = []
+    for task in tasks:
+        if not task.is_active:
+            continue
+        haystack = (task.title + " " + task.description).casefold()
+        if words and not all(word in haystack for word in words):
+            continue
+        if start is not None and task.reminder_time < start:
+            continue
+        if end is not None and task.reminder_time >= end:
+            continue
+        matches.append(task)
+    matches.sort(key=lambda task: task.reminder_time)
+    return matches
+
+
+def run(count):
+    now = datetime.now()
+    tasks = generate_tasks(count, now=now)
+    index = TaskSearchIndex()
+    start = time.perf_counter()
+    index.update(tasks)
+    build = time.perf_counter() - start
+    print(f"{count} tasks: index built in {build:.2f}s ({len(index.vocabulary)} distinct tokens)")
+
+    week = due_window("This week", now)
+    queries = [
+        ("word", "rent", None, None, 'reminder_time', False, 0),
+        ("one letter", "t", None, None, 'reminder_time', False, 0),
+        ("word, by title", "rent", None, None, 'title', False, 0),
+        ("shared word, by status", "owner", None, None, 'status', False, 0),
+        ("letter, week, by title", "s", week[0], week[1], 'title', False, 0),
+        ("prefix", "medic", None, None, 'reminder_time', False, 0),
+        ("two prefixes", "task 12", None, None, 'reminder_time', False, 0),
+        ("unique id", f"task {count // 2}", None, None, 'reminder_time', False, 0),
+        ("due this week", "", week[0], week[1], 'reminder_time', False, 0),
+        ("this week, by title", "", week[0], week[1], 'title', False, 0),
+        ("this week, by status", "", week[0], week[1], 'status', True, 0),
+        ("overdue", "", None, now, 'reminder_time', False, 0),
+        ("word + next 7 days", "gym", now, now + timedelta(days=7), 'reminder_time', False, 0),
+        ("word, by title desc", "rent", None, None, 'title', True, 0),
+        ("all, by title", "", None, None, 'title', False, 0),
+        ("all, by time", "", None, None, 'reminder_time', False, 0),
+        ("all, by status", "", None, None, 'status', False, 0),
+        ("all, page 50", "", None, None, 'reminder_time', True, 50 * PAGE),
+    ]
+    for label, text, range_start, range_end, sort_by, descending, offset in queries:
+        start = time.perf_counter()
+        total, page = index.search_page(text, range_start, range_end, sort_by=sort_by,
+                                        descending=descending, offset=offset, limit=PAGE)
+        query = (time.perf_counter() - start) * 1000
+        ids = index.search(text, range_start, range_end, sort_by=sort_by, descending=descending)
+        if total != len(ids) or page != ids[offset:offset + PAGE]:
+            print(f"  {label}: page does not match the full result")
+        start = time.perf_counter()
+        expected = scan(tasks, text, range_start, range_end)
+        linear = (time.perf_counter() - start) * 1000
+        # The index matches word prefixes, the scan substrings, so compare only when they agree
+        agree = "" if {task.id for task in expected} == set(ids) else "  (substring scan differs)"
+        print(f"  {label:<24} {len(ids):>8} hits  index {query:8.2f} ms   scan {linear:9.2f} ms{agree}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 500_000]
+    for size in sizes:
+        run(size)
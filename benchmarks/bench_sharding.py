@@ -0,0 +1,59 @@
+"""Measure ShardedReminderEngine throughput at 1, 2, 4 and 8 worker processes.
+
+Adds tasks for many owners in batches, completes a tenth of them and
+gathers metrics, timing each phase against the number of shards.
+
+Usage: python benchmarks/bench_sharding.py [tasks] [workers...]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import ShardedReminderEngine
+
+BATCH_SIZE = 5_000
+OWNERS = 1_000
+
+
+def make_entries(count):
+    start = datetime.now() + timedelta(days=1)
+    return [(f"Task {i}", "Synthetic benchmark task", start + timedelta(seconds=i),
+             f"user{i % OWNERS}@example.com", "", "") for i in range(count)]
+
+
+def run(count, workers, entries):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        engine = ShardedReminderEngine(shard_count=workers, data_dir=tmp)
+        engine.metrics()
+        startup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ids = []
+        for offset in range(0, count, BATCH_SIZE):
+            ids.extend(engine.add_tasks(entries[offset:offset + BATCH_SIZE]))
+        add = time.perf_counter() - start
+
+        start = time.perf_counter()
+        completed = engine.complete_tasks(ids[::10])
+        complete = time.perf_counter() - start
+
+        metrics = engine.metrics()
+        engine.stop()
+
+    sizes = "/".join(str(shard['tasks']) for shard in metrics['shards'])
+    print(f"{workers} workers  startup {startup:6.2f}s  add {count / add:9.0f} tasks/s  "
+          f"complete {completed / complete:9.0f} tasks/s  pending {metrics['pending']}  shards {sizes}")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = [int(arg) for arg in sys.argv[2:]] or [1, 2, 4, 8]
+    entries = make_entries(count)
+    print(f"{count} tasks, {os.cpu_count()} CPUs")
+    for worker_count in workers:
+        run(count, worker_count, entries)
@@ -0,0 +1,57 @@
+"""Measure reminder email throughput against a local SMTP sink.
+
+Compares one connection per message (the old send_email behaviour) with
+the pooled SMTPConnectionPool.
+
+Usage: python benchmarks/bench_smtp.py [messages]
+"""
+import os
+import smtplib
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import SMTPConnectionPool
+from smtp_sink import SMTPSink
+
+SENDER = "reminders@example.com"
+
+
+def make_messages(count):
+    text = f"Subject: Task Reminder\r\n\r\nReminder generated at {datetime.now()}\r\n"
+    return [(SENDER, f"user{i}@example.com", text) for i in range(count)]
+
+
+def per_message(port, messages):
+    for sender, recipient, text in messages:
+        server = smtplib.SMTP("127.0.0.1", port)
+        server.sendmail(sender, recipient, text)
+        server.quit()
+
+
+def pooled(port, messages):
+    pool = SMTPConnectionPool("127.0.0.1", port, "", "", use_tls=False)
+    pool.send_many(messages)
+    pool.close()
+    return pool
+
+
+def run(count):
+    sink = SMTPSink().start()
+    messages = make_messages(count)
+    try:
+        for name, func in (("connection per message", per_message), ("pooled session", pooled)):
+            before = sink.sessions
+            start = time.perf_counter()
+            func(sink.port, messages)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} {count} messages in {elapsed:.3f}s  "
+                  f"{count / elapsed:8.0f} msg/s  ({sink.sessions - before} sessions)")
+    finally:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
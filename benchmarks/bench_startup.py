@@ -0,0 +1,99 @@
+"""Measure how long the engine takes to become usable on large task stores.
+
+Covers the JSON snapshot/journal store and the SQLite store.
+
+Usage: python benchmarks/bench_startup.py [sizes...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import JournalTaskStore, ReminderEngine, SQLiteTaskStore, Task, task_from_dict
+
+
+def make_tasks(count):
+    now = datetime.now()
+    return [Task(
+        id=str(i),
+        title=f"Task {i}",
+        description="Synthetic benchmark task",
+        reminder_time=now + timedelta(minutes=i - count // 2),
+        email="",
+        phone="",
+        is_completed=i < count // 2,
+        is_active=i < count // 2 or i % 10 != 0
+    ) for i in range(count)]
+
+
+def write_store(directory, tasks):
+    count = len(tasks)
+    path = os.path.join(directory, "tasks.json")
+    store = JournalTaskStore(path)
+    store.compact(tasks)
+    store.save_header(count - 1, tasks[count // 2].reminder_time)
+    store.close()
+    return path
+
+
+def write_sqlite(directory, tasks):
+    store = SQLiteTaskStore(os.path.join(directory, "tasks.db"))
+    store.write(tasks)
+    store.close()
+    # The engine derives tasks.db from the data file name
+    return os.path.join(directory, "tasks.json")
+
+
+def legacy_load(path):
+    # The original load_tasks: json.load, decode every record, second pass for the counter
+    with open(path, 'r') as f:
+        tasks_data = json.load(f)
+    tasks = [task_from_dict(task_data) for task_data in tasks_data]
+    return max(int(task.id) for task in tasks) + 1
+
+
+def timed_engine(path, settings, background, storage="json"):
+    start = time.perf_counter()
+    engine = ReminderEngine(storage=storage, data_file=path, settings_file=settings,
+                            background_load=background)
+    usable = time.perf_counter() - start
+    engine.loaded.wait()
+    loaded = time.perf_counter() - start
+    engine.stop()
+    return usable * 1000, loaded * 1000
+
+
+def run(count):
+    tasks = make_tasks(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_store(tmp, tasks)
+        settings = os.path.join(tmp, "email_settings.json")
+
+        start = time.perf_counter()
+        legacy_load(path)
+        legacy = (time.perf_counter() - start) * 1000
+        sync_usable, _ = timed_engine(path, settings, background=False)
+        # Stopping the engine rewrites the header, so the background run can use it
+        bg_usable, bg_loaded = timed_engine(path, settings, background=True)
+
+    print(f"{count:>8} tasks  json    legacy load {legacy:8.1f} ms   streaming load {sync_usable:8.1f} ms   "
+          f"header start: usable {bg_usable:6.1f} ms, fully loaded {bg_loaded:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_sqlite(tmp, tasks)
+        settings = os.path.join(tmp, "email_settings.json")
+        sync_usable, _ = timed_engine(path, settings, background=False, storage="sqlite")
+        bg_usable, bg_loaded = timed_engine(path, settings, background=True, storage="sqlite")
+
+    print(f"{count:>8} tasks  sqlite                        blocking load  {sync_usable:8.1f} ms   "
+          f"header start: usable {bg_usable:6.1f} ms, fully loaded {bg_loaded:8.1f} ms")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for size in sizes:
+        run(size)
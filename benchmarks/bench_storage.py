@@ -0,0 +1,76 @@
+"""Compare the JSON journal store against the SQLite store.
+
+Usage: python benchmarks/bench_storage.py [sizes...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import JournalTaskStore, SQLiteTaskStore, Task
+
+UPDATES = 200
+
+
+def make_tasks(count, now):
+    tasks = []
+    for i in range(count):
+        task = Task(
+            id=str(i),
+            title=f"Task {i}",
+            description="Synthetic benchmark task",
+            reminder_time=now + timedelta(minutes=random.randint(-60, 60 * 24 * 30)),
+            email=f"user{i % 100}@example.com",
+            phone=""
+        )
+        task.is_completed = random.random() < 0.5
+        task.is_active = not task.is_completed
+        tasks.append(task)
+    return tasks
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def bench_store(name, store, tasks):
+    results = {}
+    def initial_write():
+        store.compact(tasks)
+        pending = [task.reminder_time for task in tasks if task.is_active and not task.is_completed]
+        store.save_header(len(tasks) - 1, min(pending, default=None))
+    results['initial write'], _ = timed(initial_write)
+
+    def single_row_updates():
+        for task in random.sample(tasks, UPDATES):
+            task.is_completed = True
+            store.write([task])
+    results[f'{UPDATES} updates'], _ = timed(single_row_updates)
+    # What the engine reads at start: the header, then every record it keeps in memory
+    results['header'], _ = timed(store.read_header)
+    results['load'], loaded = timed(lambda: list(store.load()))
+    store.close()
+    print(f"  {name:<7}" + "".join(f"  {label} {ms:8.1f} ms" for label, ms in results.items())
+          + f"  ({len(loaded)} loaded)")
+
+
+def run(count):
+    random.seed(count)
+    now = datetime.now()
+    tasks = make_tasks(count, now)
+    print(f"{count} tasks")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_store("json", JournalTaskStore(os.path.join(tmp, "tasks.json")), tasks)
+        bench_store("sqlite", SQLiteTaskStore(os.path.join(tmp, "tasks.db")), tasks)
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run(size)
@@ -0,0 +1,155 @@
+"""Time the reminder engine's hot paths on synthetic workloads and write JSON results.
+
+Covers load_tasks, save_tasks, process_reminders, refresh_tasks (task list
+render against a Treeview or the in-memory stub) and send_email against a
+local SMTP sink. Pass --compare with an earlier results file to flag
+regressions.
+
+Usage: python benchmarks/run_suite.py [--sizes 1000 10000 ...] [--output results.json]
+                                      [--compare baseline.json] [--seed N]
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import ReminderEngine, SMTPConnectionPool, TaskListView
+from smtp_sink import SMTPSink
+from tk_stub import make_tree
+from workload import generate_tasks, write_store
+
+EMAILS = 500
+REGRESSION_RATIO = 1.2
+
+
+def timed(func, *args):
+    """Run func quietly and return (seconds, result)"""
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args)
+        return time.perf_counter() - start, result
+
+
+def make_engine(path, tmp):
+    return ReminderEngine(data_file=path, settings_file=os.path.join(tmp, "email_settings.json"),
+                          desktop_notifier=lambda tasks: None)
+
+
+def bench_size(count, seed, sink):
+    results = {}
+
+    def record(name, seconds, items):
+        results[name] = {'seconds': round(seconds, 6), 'items': items,
+                         'per_second': round(items / seconds, 1) if seconds else None}
+
+    tasks = generate_tasks(count, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_store(tmp, tasks)
+        del tasks
+
+        seconds, engine = timed(make_engine, path, tmp)
+        record('load_tasks', seconds, len(engine.tasks))
+
+        seconds, _ = timed(engine.save_tasks)
+        record('save_tasks', seconds, len(engine.tasks))
+
+        # The scheduler thread stays off so the tick is timed on this thread.
+        # Loading holds overdue reminders back for catch-up; put them back in
+        # the due index so the tick fires them as before
+        engine.dispatcher.start()
+        engine.scheduler.schedule_many(engine.missed)
+        engine.missed = []
+        due = len(engine.due_index)
+        seconds, _ = timed(engine.process_reminders)
+        record('process_reminders', seconds, due - len(engine.due_index))
+
+        tree, kind = make_tree()
+        view = TaskListView(tree)
+        seconds, _ = timed(view.render, engine.tasks.values())
+        record('refresh_tasks_first', seconds, min(view.total, view.page_size))
+        next(iter(engine.tasks.values())).is_completed = True
+        seconds, _ = timed(view.render, engine.tasks.values())
+        record('refresh_tasks_change', seconds, 1)
+
+        engine.email_username = "reminders@example.com"
+        engine.mail_pool = SMTPConnectionPool("127.0.0.1", sink.port, "", "", use_tls=False)
+        batches = [[task] for task in list(engine.tasks.values())[:min(count, EMAILS)]]
+        for batch in batches:
+            batch[0].email = batch[0].email or "user@example.com"
+
+        def send_all():
+            for batch in batches:
+                engine.send_email(batch)
+
+        seconds, _ = timed(send_all)
+        record('send_email', seconds, len(batches))
+
+        with redirect_stdout(io.StringIO()):
+            engine.stop()
+    return results, kind
+
+
+def compare(results, baseline_path):
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)['results']
+    print(f"\nCompared with {baseline_path} (ratio > {REGRESSION_RATIO} flagged):")
+    for size, operations in results.items():
+        for name, current in operations.items():
+            previous = baseline.get(size, {}).get(name)
+            if not previous or not previous['seconds']:
+                continue
+            ratio = current['seconds'] / previous['seconds']
+            flag = "  REGRESSION" if ratio > REGRESSION_RATIO else ""
+            print(f"  {size:>8} {name:<22} {previous['seconds']:10.4f}s -> {current['seconds']:10.4f}s "
+                  f"({ratio:5.2f}x){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reminder engine benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE")
+    args = parser.parse_args()
+
+    sink = SMTPSink().start()
+    results = {}
+    tree_kind = None
+    try:
+        for count in args.sizes:
+            results[str(count)], tree_kind = bench_size(count, args.seed, sink)
+            for name, result in results[str(count)].items():
+                print(f"{count:>8} {name:<22} {result['seconds']:10.4f}s  "
+                      f"{result['items']:>8} items  {result['per_second'] or 0:12.0f}/s")
+    finally:
+        sink.stop()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'seed': args.seed,
+            'tree': tree_kind
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
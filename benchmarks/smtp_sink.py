@@ -0,0 +1,64 @@
+"""Minimal local SMTP server that accepts and discards messages.
+
+Speaks just enough SMTP (no TLS, no AUTH) for smtplib to deliver mail, so
+the mail path can be exercised without aiosmtpd or a real server.
+"""
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.server.sessions += 1
+        self.reply("220 localhost SMTP sink")
+        in_data = False
+        for raw in self.rfile:
+            line = raw.rstrip(b"\r\n")
+            if in_data:
+                if line == b".":
+                    in_data = False
+                    with self.server.lock:
+                        self.server.messages += 1
+                    self.reply("250 OK")
+                continue
+
+            command = line[:4].upper()
+            if command == b"EHLO":
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif command == b"DATA":
+                in_data = True
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            elif command in (b"HELO", b"MAIL", b"RCPT", b"RSET", b"NOOP"):
+                self.reply("250 OK")
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.sessions = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
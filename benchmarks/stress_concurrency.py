@@ -0,0 +1,125 @@
+"""Stress the engine with concurrent edits, scans and compactions while reminders fire.
+
+Worker threads add, complete and delete tasks, read snapshots and run
+searches while a saver thread compacts the store and the scheduler fires a
+steady stream of due reminders. Afterwards the store is reloaded and
+checked against the in-memory tasks and the search index.
+
+Usage: python benchmarks/stress_concurrency.py [threads] [operations per thread]
+"""
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import ReminderEngine, task_to_dict
+
+counts_lock = threading.Lock()
+
+
+def mutate(engine, operations, seed, errors, counts):
+    rng = random.Random(seed)
+    # Per-thread tallies, merged once at the end
+    local = dict.fromkeys(counts, 0)
+    for _ in range(operations):
+        roll = rng.random()
+        try:
+            if roll < 0.45:
+                due = datetime.now() + timedelta(seconds=rng.uniform(0, 2))
+                recurrence = "FREQ=DAILY" if rng.random() < 0.1 else ""
+                engine.add_task(f"stress {seed}", "concurrent add", due, recurrence=recurrence)
+                local['add'] += 1
+            elif roll < 0.65:
+                tasks = engine.snapshot()
+                if tasks:
+                    engine.complete_tasks([rng.choice(tasks)])
+                local['complete'] += 1
+            elif roll < 0.8:
+                tasks = engine.snapshot()
+                if tasks:
+                    engine.delete_tasks([rng.choice(tasks)])
+                local['delete'] += 1
+            elif roll < 0.9:
+                engine.search_index.search("stress", datetime.now(), None)
+                local['search'] += 1
+            else:
+                sum(task.is_completed for task in engine.snapshot())
+                local['scan'] += 1
+        except Exception as e:
+            errors.append(repr(e))
+    with counts_lock:
+        for name, value in local.items():
+            counts[name] += value
+
+
+def save_loop(engine, stop, counts):
+    while not stop.is_set():
+        engine.save_tasks()
+        counts['compact'] += 1
+        time.sleep(0.01)
+
+
+def run(thread_count, operations):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tasks.json")
+        settings = os.path.join(tmp, "email_settings.json")
+        fired = []
+        engine = ReminderEngine(data_file=path, settings_file=settings,
+                                desktop_notifier=lambda tasks: fired.extend(tasks))
+        engine.start()
+
+        errors = []
+        counts = {name: 0 for name in ('add', 'complete', 'delete', 'search', 'scan', 'compact')}
+        stop = threading.Event()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            saver = threading.Thread(target=save_loop, args=(engine, stop, counts))
+            workers = [threading.Thread(target=mutate, args=(engine, operations, seed, errors, counts))
+                       for seed in range(thread_count)]
+            start = time.perf_counter()
+            saver.start()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+            stop.set()
+            saver.join()
+            # Let the last reminders fire before stopping
+            time.sleep(2.5)
+            engine.stop()
+
+        logged = [line for line in output.getvalue().splitlines() if line.startswith("Error")]
+        expected = {task.id: task_to_dict(task) for task in engine.snapshot()}
+        indexed = set(engine.search_index.search(""))
+        active = {task_id for task_id, task_data in expected.items() if task_data['is_active']}
+
+        with redirect_stdout(io.StringIO()):
+            reloaded = ReminderEngine(data_file=path, settings_file=settings)
+            stored = {task.id: task_to_dict(task) for task in reloaded.snapshot()}
+            reloaded.stop()
+
+    mismatched = [task_id for task_id in expected.keys() | stored.keys()
+                  if expected.get(task_id) != stored.get(task_id)]
+    total = sum(counts[name] for name in ('add', 'complete', 'delete', 'search', 'scan'))
+    print(f"{thread_count} threads x {operations} ops: {total} operations in {elapsed:.2f}s "
+          f"({total / elapsed:.0f} ops/s), {counts['compact']} compactions, {len(fired)} reminders fired")
+    print(f"  {len(expected)} tasks in memory, {len(stored)} reloaded, {len(mismatched)} mismatched, "
+          f"search index {'matches' if indexed == active else 'DIFFERS from'} active tasks")
+    print(f"  {len(errors)} exceptions, {len(logged)} logged errors")
+    for message in (errors + logged)[:5]:
+        print(f"    {message}")
+    return not (errors or logged or mismatched or indexed != active)
+
+
+if __name__ == "__main__":
+    thread_count = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    sys.exit(0 if run(thread_count, operations) else 1)
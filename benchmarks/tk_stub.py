@@ -0,0 +1,64 @@
+"""In-memory stand-in for ttk.Treeview, for timing list rendering without a display."""
+
+
+class StubTreeview:
+    """Keeps row order in a dict, so deleting a row costs O(1) as in Tk"""
+    def __init__(self):
+        self._order = {}
+        self._values = {}
+        self._next_iid = 0
+        self.calls = 0
+
+    def _place(self, iid, index):
+        if index == "end" or index >= len(self._order):
+            self._order[iid] = None
+        else:
+            order = list(self._order)
+            order.insert(index, iid)
+            self._order = dict.fromkeys(order)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.calls += 1
+        if iid is None:
+            iid = f"I{self._next_iid:03X}"
+            self._next_iid += 1
+        self._place(iid, index)
+        self._values[iid] = tuple(values)
+        return iid
+
+    def delete(self, *items):
+        self.calls += 1
+        for iid in items:
+            del self._order[iid]
+            del self._values[iid]
+
+    def item(self, iid, values=None):
+        self.calls += 1
+        if values is None:
+            return {'values': list(self._values[iid])}
+        self._values[iid] = tuple(values)
+
+    def move(self, iid, parent, index):
+        self.calls += 1
+        del self._order[iid]
+        self._place(iid, index)
+
+    def get_children(self, item=""):
+        self.calls += 1
+        return tuple(self._order)
+
+    def selection(self):
+        return ()
+
+
+def make_tree():
+    """Return a real Treeview when a display is available, otherwise the stub"""
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.withdraw()
+    except Exception:
+        return StubTreeview(), "stub"
+    columns = ("Title", "Description", "Reminder Time", "Status")
+    return ttk.Treeview(root, columns=columns, show="headings"), "tk"
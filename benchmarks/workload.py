@@ -0,0 +1,79 @@
+"""Seeded synthetic task workloads for the benchmark suite.
+
+Due times follow a heavy-tailed distribution (most tasks due soon, a long
+tail far out), a share of tasks is packed into a few one-second burst
+windows, a share is already overdue, and titles are drawn from a small
+pool so many tasks share one.
+"""
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from script import JournalTaskStore, Task
+
+COMMON_TITLES = ("Pay rent", "Team standup", "Take medication", "Call mom", "Water plants",
+                 "Submit timesheet", "Gym", "Renew subscription", "Backup laptop", "Dentist")
+
+
+def generate_tasks(count, seed=0, now=None, skew=1.2, horizon_days=365, bursts=5,
+                   burst_fraction=0.2, overdue_fraction=0.05, duplicate_fraction=0.4,
+                   completed_fraction=0.3, owners=1000, email_fraction=0.0):
+    """Return count Tasks; the same arguments always give the same workload relative to now"""
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    horizon = horizon_days * 86400
+    burst_times = [rng.uniform(60, 3600) for _ in range(bursts)]
+
+    tasks = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < overdue_fraction:
+            offset = -rng.uniform(1, 86400)
+        elif roll < overdue_fraction + burst_fraction:
+            offset = rng.choice(burst_times) + rng.random()
+        else:
+            # Pareto offsets: most tasks land within hours, a few months away
+            offset = min(horizon, (rng.paretovariate(skew) - 1) * 3600)
+
+        if rng.random() < duplicate_fraction:
+            title = rng.choice(COMMON_TITLES)
+        else:
+            title = f"Task {i}"
+
+        completed = offset > 0 and rng.random() < completed_fraction
+        owner = rng.randrange(owners)
+        tasks.append(Task(
+            id=str(i),
+            title=title,
+            description=f"Synthetic workload task {i} for owner {owner}",
+            reminder_time=now + timedelta(seconds=offset),
+            email=f"user{owner}@example.com" if rng.random() < email_fraction else "",
+            phone="",
+            is_completed=completed,
+            is_active=not completed or rng.random() < 0.5
+        ))
+    return tasks
+
+
+def write_store(directory, tasks, name="tasks.json"):
+    """Write tasks as a compacted JSON store with a header and return its path"""
+    path = os.path.join(directory, name)
+    store = JournalTaskStore(path)
+    store.compact(tasks)
+    pending = [task.reminder_time for task in tasks if task.is_active and not task.is_completed]
+    store.save_header(len(tasks) - 1 if tasks else None, min(pending) if pending else None)
+    store.close()
+    return path
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    tasks = generate_tasks(count)
+    now = datetime.now()
+    overdue = sum(task.reminder_time <= now for task in tasks)
+    titles = len({task.title for task in tasks})
+    print(f"{count} tasks: {overdue} overdue, {titles} distinct titles, "
+          f"{sum(task.is_completed for task in tasks)} completed")
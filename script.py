@@ -1,5 +1,9 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+try:
+    import tkinter as tk
+    from tkinter import ttk, messagebox, scrolledtext
+except ImportError:
+    # Headless installs can run the daemon without Tk
+    tk = None
 from datetime import datetime, timedelta
 import threading
 import time
@@ -8,11 +12,26 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import json
 import os
-from dataclasses import dataclass
-from typing import List, Optional
-import schedule
+import heapq
+import itertools
+import re
+import sqlite3
+import multiprocessing
+import hashlib
+import bisect
+import argparse
+import calendar
+import csv
+import queue
+import signal
+from collections import deque
+from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     id: str
     title: str
@@ -22,38 +41,2831 @@ class Task:
     phone: str
     is_completed: bool = False
     is_active: bool = True
+    # RRULE subset (see RecurrenceRule); empty for one-off reminders
+    recurrence: str = ""
+    # ISO text of reminder_time while it has not been decoded yet
+    _raw_reminder_time: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @classmethod
+    def lazy(cls, task_data):
+        """Build a Task whose reminder_time is only parsed on first access"""
+        task = cls.__new__(cls)
+        task.id = task_data['id']
+        task.title = task_data['title']
+        task.description = task_data['description']
+        task.email = task_data['email']
+        task.phone = task_data['phone']
+        task.is_completed = task_data.get('is_completed', False)
+        task.is_active = task_data.get('is_active', True)
+        task.recurrence = task_data.get('recurrence', '')
+        task._raw_reminder_time = task_data['reminder_time']
+        return task
+    
+    def __getattr__(self, name):
+        # Only reached when a slot is unset, i.e. a lazy reminder_time
+        if name != 'reminder_time':
+            raise AttributeError(name)
+        # Read the raw text once: another thread may decode it between two reads.
+        # Decoding sets the slot before clearing the text, so no text means a set slot
+        raw = self._raw_reminder_time
+        if raw is None:
+            return object.__getattribute__(self, 'reminder_time')
+        value = datetime.fromisoformat(raw)
+        self.reminder_time = value
+        self._raw_reminder_time = None
+        return value
+    
+    def reminder_iso(self):
+        """Return reminder_time as ISO text without decoding a lazy value"""
+        try:
+            return object.__getattribute__(self, 'reminder_time').isoformat()
+        except AttributeError:
+            raw = self._raw_reminder_time
+            if raw is None:
+                # Decoded by another thread since the slot read
+                return object.__getattribute__(self, 'reminder_time').isoformat()
+            return raw
+
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    """Subset of RFC 5545 RRULE: DAILY/WEEKLY/MONTHLY with INTERVAL, BYDAY, BYMONTHDAY, COUNT and UNTIL
+
+    A task stores only its next occurrence; COUNT holds the occurrences
+    left including that one, so the series needs no start date.
+    """
+    freq: str
+    interval: int = 1
+    by_day: tuple = ()
+    by_month_day: tuple = ()
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    
+    @classmethod
+    def parse(cls, text):
+        parts = {}
+        for part in text.strip().upper().removeprefix("RRULE:").split(';'):
+            if part:
+                key, sep, value = part.partition('=')
+                if not sep or not value:
+                    raise ValueError(f"Invalid recurrence part: {part}")
+                parts[key] = value
+        
+        freq = parts.pop('FREQ', None)
+        if freq not in ('DAILY', 'WEEKLY', 'MONTHLY'):
+            raise ValueError("Recurrence FREQ must be DAILY, WEEKLY or MONTHLY")
+        interval = int(parts.pop('INTERVAL', 1))
+        by_day = ()
+        if 'BYDAY' in parts:
+            days = parts.pop('BYDAY').split(',')
+            unknown = [day for day in days if day not in WEEKDAYS]
+            if unknown:
+                raise ValueError(f"Unknown BYDAY weekday: {', '.join(unknown)}")
+            by_day = tuple(sorted(WEEKDAYS.index(day) for day in days))
+        by_month_day = tuple(int(day) for day in parts.pop('BYMONTHDAY').split(',')) \
+            if 'BYMONTHDAY' in parts else ()
+        count = int(parts.pop('COUNT')) if 'COUNT' in parts else None
+        until = cls._parse_until(parts.pop('UNTIL')) if 'UNTIL' in parts else None
+        if parts:
+            raise ValueError(f"Unsupported recurrence parts: {', '.join(parts)}")
+        if interval < 1 or (count is not None and count < 1):
+            raise ValueError("Recurrence INTERVAL and COUNT must be positive")
+        if any(day == 0 or not -31 <= day <= 31 for day in by_month_day):
+            raise ValueError("Recurrence BYMONTHDAY must be between -31 and 31")
+        if freq == 'WEEKLY' and by_month_day:
+            # RFC 5545 does not allow BYMONTHDAY with a WEEKLY rule
+            raise ValueError("Recurrence BYMONTHDAY cannot be used with FREQ=WEEKLY")
+        return cls(freq, interval, by_day, by_month_day, count, until)
+    
+    @staticmethod
+    def _parse_until(value):
+        try:
+            if len(value) == 8:
+                # A date-only UNTIL includes that whole day
+                return datetime.strptime(value, "%Y%m%d").replace(hour=23, minute=59, second=59)
+            return datetime.strptime(value.removesuffix('Z'), "%Y%m%dT%H%M%S")
+        except ValueError:
+            raise ValueError(f"Recurrence UNTIL must be YYYYMMDD or YYYYMMDDTHHMMSS, got {value}")
+    
+    def __str__(self):
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.by_day))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(str(day) for day in self.by_month_day))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%dT%H%M%S')}")
+        return ";".join(parts)
+    
+    def _step(self, current):
+        """Return the occurrence following current"""
+        if self.freq == 'DAILY':
+            # BYDAY and BYMONTHDAY limit which of the daily steps occur
+            candidate = current
+            for _ in range(1500):
+                candidate += timedelta(days=self.interval)
+                if self._matches_day(candidate):
+                    return candidate
+            raise ValueError(f"Recurrence {self} has no further occurrences")
+        
+        if self.freq == 'WEEKLY':
+            week_start = current - timedelta(days=current.weekday())
+            while True:
+                for day in self.by_day or (current.weekday(),):
+                    candidate = week_start + timedelta(days=day)
+                    if candidate > current:
+                        return candidate
+                week_start += timedelta(weeks=self.interval)
+        
+        year, month = current.year, current.month
+        # A month day that never occurs (e.g. Feb 30 every 12 months) must not spin forever
+        for _ in range(48):
+            month_length = calendar.monthrange(year, month)[1]
+            if self.by_month_day:
+                days = sorted(day if day > 0 else month_length + day + 1 for day in self.by_month_day)
+            elif self.by_day:
+                # BYDAY alone means every matching weekday of the month
+                days = range(1, month_length + 1)
+            else:
+                days = (current.day,)
+            for day in days:
+                # Months without the day are skipped, as in RFC 5545
+                if 1 <= day <= month_length and (not self.by_day or
+                                                 calendar.weekday(year, month, day) in self.by_day):
+                    candidate = current.replace(year=year, month=month, day=day)
+                    if candidate > current:
+                        return candidate
+            month += self.interval
+            year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+        raise ValueError(f"Recurrence {self} has no further occurrences")
+    
+    def _matches_day(self, moment):
+        if self.by_day and moment.weekday() not in self.by_day:
+            return False
+        if self.by_month_day:
+            month_length = calendar.monthrange(moment.year, moment.month)[1]
+            return moment.day in self.by_month_day or moment.day - month_length - 1 in self.by_month_day
+        return True
+    
+    def occurrences(self, current):
+        """Lazily yield the occurrences after current, honouring COUNT and UNTIL"""
+        remaining = self.count
+        while remaining is None or remaining > 1:
+            current = self._step(current)
+            if self.until is not None and current > self.until:
+                return
+            if remaining is not None:
+                remaining -= 1
+            yield current
+    
+    def advance(self, current, now):
+        """Return (next occurrence after now, rule for the rest of the series), or None when it ends"""
+        skipped = 0
+        for occurrence in self.occurrences(current):
+            skipped += 1
+            if occurrence > now:
+                count = None if self.count is None else self.count - skipped
+                return occurrence, replace(self, count=count)
+        return None
+
+RECURRENCE_PRESETS = {
+    "": "",
+    "none": "",
+    "daily": "FREQ=DAILY",
+    "weekdays": "FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR",
+    "weekly": "FREQ=WEEKLY",
+    "monthly": "FREQ=MONTHLY"
+}
+
+def parse_recurrence(text):
+    """Normalize a preset name or RRULE string; raises ValueError with a user-facing message"""
+    text = (text or "").strip()
+    if text.lower() in RECURRENCE_PRESETS:
+        return RECURRENCE_PRESETS[text.lower()]
+    try:
+        return str(RecurrenceRule.parse(text))
+    except (ValueError, KeyError) as e:
+        raise ValueError(f"Please enter a valid repeat rule (Daily, Weekly, Monthly or an RRULE): {str(e)}")
+
+# Metrics
+METRIC_HELP = {
+    'reminder_tick_seconds': "Time spent in one process_reminders pass",
+    'reminder_lateness_seconds': "Fire time minus reminder_time for each reminder sent",
+    'reminders_fired_total': "Reminders fired by the scheduler",
+    'pending_reminders': "Reminders waiting in the due index",
+    'tasks': "Tasks held in memory",
+    'task_load_seconds': "Time to load every task from the store",
+    'task_load_bytes': "Store size on disk when tasks were loaded",
+    'task_save_seconds': "Time to write a full snapshot of the tasks",
+    'task_save_bytes': "Store size on disk after the last full save",
+    'task_journal_write_seconds': "Time to journal one batch of task changes",
+    'task_journal_bytes_total': "Bytes appended to the task journal",
+    'smtp_connect_seconds': "Time to open and authenticate an SMTP session",
+    'smtp_send_seconds': "Time to send one email over an open session",
+    'task_list_render_seconds': "Time to render the task list",
+    'task_search_seconds': "Time to answer one task search query",
+    'reminder_catchup_lateness_seconds': "Lateness of each reminder missed while the app was down",
+    'reminders_missed_total': "Reminders that fell due while the app was down",
+    'reminders_skipped_total': "Missed reminders dropped by the skip catch-up policy",
+    'notification_queue_depth': "Notifications waiting in each channel's queue",
+    'notification_latency_avg_seconds': "Mean time from queueing to delivery per channel",
+    'notification_latency_max_seconds': "Longest time from queueing to delivery per channel",
+    'notifications_sent_total': "Notifications delivered per channel",
+    'notifications_failed_total': "Delivery attempts that raised, per channel",
+    'notifications_retried_total': "Notifications queued again after a failure, per channel",
+    'notifications_dead_lettered_total': "Notifications dropped after retries or a full queue, per channel"
+}
+
+def metric_key(name, **labels):
+    """Registry key for a labelled series, e.g. notification_queue_depth{channel="email"}"""
+    if not labels:
+        return name
+    family, _, existing = name.partition('{')
+    pairs = [existing.rstrip('}')] if existing else []
+    pairs.extend(f'{label}="{value}"' for label, value in labels.items())
+    return f"{family}{{{','.join(pairs)}}}"
+
+class Histogram:
+    """Observation counts per upper bound, exported as cumulative Prometheus buckets"""
+    SECONDS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0, 3600.0)
+    
+    def __init__(self, buckets=SECONDS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'start')
+    
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+class MetricsRegistry:
+    """Counters, gauges and latency histograms, served as Prometheus text or dumped as JSON"""
+    def __init__(self, enabled=True, descriptions=METRIC_HELP):
+        self.enabled = enabled
+        self.descriptions = dict(descriptions)
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        # Callables returning snapshot-shaped dicts, merged into every export
+        self.collectors: List[Callable[[], dict]] = []
+        # Last output of collectors that were removed, e.g. of a stopped engine
+        self.retired: List[dict] = []
+        self._lock = threading.Lock()
+        self._server = None
+    
+    def add_collector(self, collector):
+        with self._lock:
+            self.collectors.append(collector)
+    
+    def remove_collector(self, collector):
+        """Unregister collector, keeping its last values in later exports"""
+        with self._lock:
+            if collector not in self.collectors:
+                return
+        final = self._collect(collector) if self.enabled else None
+        with self._lock:
+            if collector in self.collectors:
+                self.collectors.remove(collector)
+                if final:
+                    self.retired.append(final)
+    
+    @staticmethod
+    def _collect(collector):
+        try:
+            return collector()
+        except Exception as e:
+            print(f"Error collecting metrics: {str(e)}")
+            return None
+    
+    @staticmethod
+    def merge(into, snapshot):
+        """Add snapshot into into: counters and histograms are summed, gauges overwritten"""
+        for name, value in snapshot.get('counters', {}).items():
+            into['counters'][name] = into['counters'].get(name, 0) + value
+        into['gauges'].update(snapshot.get('gauges', {}))
+        for name, histogram in snapshot.get('histograms', {}).items():
+            current = into['histograms'].get(name)
+            if current is None:
+                into['histograms'][name] = {'count': histogram['count'], 'sum': histogram['sum'],
+                                            'buckets': [list(bucket) for bucket in histogram['buckets']]}
+                continue
+            current['count'] += histogram['count']
+            current['sum'] += histogram['sum']
+            for bucket, (_, count) in zip(current['buckets'], histogram['buckets']):
+                bucket[1] += count
+    
+    def inc(self, name, amount=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def set_gauge(self, name, value):
+        if self.enabled:
+            with self._lock:
+                self.gauges[name] = value
+    
+    def observe(self, name, value):
+        if self.enabled:
+            with self._lock:
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram()
+                histogram.observe(value)
+    
+    def timer(self, name):
+        """Time a block into a histogram; a shared no-op context when metrics are off"""
+        return _Timer(self, name) if self.enabled else nullcontext()
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            snapshot = {
+                'counters': dict(self.counters),
+                'gauges': dict(self.gauges),
+                'histograms': {
+                    name: {'count': histogram.count, 'sum': histogram.sum,
+                           'buckets': [[bound, count] for bound, count in histogram.cumulative()]}
+                    for name, histogram in self.histograms.items()
+                }
+            }
+            collectors = list(self.collectors) if self.enabled else []
+            retired = list(self.retired)
+        # Collectors may block, e.g. on shard workers, so they run outside the lock
+        for collected in retired + [self._collect(collector) for collector in collectors]:
+            if collected:
+                self.merge(snapshot, collected)
+        return snapshot
+    
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines = []
+        
+        def family(key):
+            return key.partition('{')[0]
+        
+        def header(name, kind):
+            if name in self.descriptions:
+                lines.append(f"# HELP {name} {self.descriptions[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+        
+        for kind in ('counter', 'gauge'):
+            previous = None
+            # Labelled series of one family must be contiguous, after one header
+            for key, value in sorted(snapshot[kind + 's'].items(), key=lambda item: (family(item[0]), item[0])):
+                if family(key) != previous:
+                    previous = family(key)
+                    header(previous, kind)
+                lines.append(f"{key} {value}")
+        for name, histogram in sorted(snapshot['histograms'].items()):
+            header(name, 'histogram')
+            for bound, count in histogram['buckets']:
+                lines.append(f'{name}_bucket{{le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{le="+Inf"}} {histogram["count"]}')
+            lines.append(f"{name}_sum {histogram['sum']}")
+            lines.append(f"{name}_count {histogram['count']}")
+        return "\n".join(lines) + "\n"
+    
+    def dump(self, path):
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.snapshot(), f, indent=2)
+        except Exception as e:
+            print(f"Error writing metrics: {str(e)}")
+    
+    def serve(self, port=0, host="127.0.0.1"):
+        """Serve /metrics (Prometheus text) and /metrics.json from a daemon thread; returns the port"""
+        registry = self
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+    
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+# Process-wide registry shared by the engine, stores, mail pool and GUI
+METRICS = MetricsRegistry()
+
+class DueIndex:
+    """Min-heap of pending reminders keyed on reminder_time, with lazy deletion"""
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._counter = 0
+        
+    def __len__(self):
+        return len(self._entries)
+    
+    def push(self, task):
+        # Re-pushing a task invalidates its previous entry
+        self.discard(task.id)
+        entry = [task.reminder_time, self._counter, task]
+        self._counter += 1
+        self._entries[task.id] = entry
+        heapq.heappush(self._heap, entry)
+    
+    def discard(self, task_id):
+        entry = self._entries.pop(task_id, None)
+        if entry is not None:
+            # Leave the entry in the heap and skip it when it surfaces
+            entry[-1] = None
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._compact()
+    
+    def rebuild(self, tasks):
+        self._entries = {}
+        self._heap = []
+        for task in tasks:
+            if task.is_active and not task.is_completed:
+                entry = [task.reminder_time, self._counter, task]
+                self._counter += 1
+                self._entries[task.id] = entry
+                self._heap.append(entry)
+        heapq.heapify(self._heap)
+    
+    def peek(self) -> Optional[datetime]:
+        """Return the earliest pending reminder time, or None"""
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+    
+    def pop_due(self, now) -> List[Task]:
+        """Remove and return every pending task whose reminder_time <= now"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            task = entry[-1]
+            if task is None:
+                continue
+            del self._entries[task.id]
+            due.append(task)
+        return due
+    
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if entry[-1] is not None]
+        heapq.heapify(self._heap)
+
+# Search
+SEARCH_TOKEN = re.compile(r"\w+")
+STATUS_ORDER = ('pending', 'repeating', 'completed')
+DUE_WINDOWS = ("Any time", "Overdue", "Today", "This week", "Next 7 days", "This month")
+
+def task_status(task):
+    if task.is_completed:
+        return 'completed'
+    return 'repeating' if task.recurrence else 'pending'
+
+def due_window(name, now=None):
+    """Return the (start, end) reminder-time range for one of DUE_WINDOWS; either may be None"""
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if name == "Overdue":
+        return None, now
+    if name == "Today":
+        return today, today + timedelta(days=1)
+    if name == "This week":
+        monday = today - timedelta(days=today.weekday())
+        return monday, monday + timedelta(days=7)
+    if name == "Next 7 days":
+        return now, now + timedelta(days=7)
+    if name == "This month":
+        first = today.replace(day=1)
+        return first, (first + timedelta(days=32)).replace(day=1)
+    return None, None
+
+# Sorts after any character a token can continue with
+MAX_CHAR = "\U0010ffff"
+NONZERO_BYTE = re.compile(rb"[^\x00]")
+
+def slot_bits(slots) -> int:
+    """Bitmap (an int) with the given slot numbers set"""
+    slots = list(slots)
+    if len(slots) <= 16:
+        bits = 0
+        for slot in slots:
+            bits |= 1 << slot
+        return bits
+    flags = bytearray((max(slots) >> 3) + 1)
+    for slot in slots:
+        flags[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(flags, 'little')
+
+def bit_slots(bits) -> Iterator[int]:
+    """Slot numbers set in a bitmap, in ascending order"""
+    data = bits.to_bytes((bits.bit_length() + 7) >> 3, 'little')
+    for match in NONZERO_BYTE.finditer(data):
+        base = match.start()
+        byte = data[base]
+        base <<= 3
+        while byte:
+            low = byte & -byte
+            yield base + low.bit_length() - 1
+            byte ^= low
+
+class SortedBlocks:
+    """Sorted (key, task id, slot) entries split into blocks, each with a bitmap of its slots
+
+    ANDing a search's bitmap with a block's tells whether the block holds
+    any match, so walks skip blocks instead of testing every entry.
+    """
+    # Rebuilds size blocks for about 256 of them; a block splits at twice its size
+    MIN_BLOCK = 512
+    
+    def __init__(self):
+        self.blocks: List[list] = []
+        self.bits: List[int] = []
+        self.firsts: List[tuple] = []
+        self.block_size = self.MIN_BLOCK
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.blocks)
+    
+    def rebuild(self, entries):
+        """Replace the contents with entries, which must be sorted"""
+        self.count = len(entries)
+        self.block_size = max(self.MIN_BLOCK, self.count // 256)
+        self.blocks = [entries[i:i + self.block_size] for i in range(0, self.count, self.block_size)]
+        self.bits = [slot_bits(entry[2] for entry in block) for block in self.blocks]
+        self.firsts = [block[0] for block in self.blocks]
+    
+    def _is_bulk(self, count):
+        return count > max(64, self.count // 16)
+    
+    def insert(self, entries):
+        if self._is_bulk(len(entries)):
+            # Two sorted runs: timsort merges them in linear time
+            merged = list(self)
+            merged.extend(sorted(entries))
+            merged.sort()
+            self.rebuild(merged)
+            return
+        
+        for entry in entries:
+            if not self.blocks:
+                self.blocks.append([entry])
+                self.bits.append(1 << entry[2])
+                self.firsts.append(entry)
+                continue
+            i = max(bisect.bisect_right(self.firsts, entry) - 1, 0)
+            block = self.blocks[i]
+            bisect.insort(block, entry)
+            self.bits[i] |= 1 << entry[2]
+            self.firsts[i] = block[0]
+            if len(block) > 2 * self.block_size:
+                half = len(block) // 2
+                self.blocks[i:i + 1] = [block[:half], block[half:]]
+                self.bits[i:i + 1] = [slot_bits(entry[2] for entry in self.blocks[i]),
+                                      slot_bits(entry[2] for entry in self.blocks[i + 1])]
+                self.firsts[i:i + 1] = [block[0], block[half]]
+        self.count += len(entries)
+        self._rebalance()
+    
+    def remove(self, entries):
+        if self._is_bulk(len(entries)):
+            dropped = set(entries)
+            self.rebuild([entry for entry in self if entry not in dropped])
+            return
+        
+        for entry in entries:
+            i = bisect.bisect_right(self.firsts, entry) - 1
+            if i < 0:
+                continue
+            block = self.blocks[i]
+            position = bisect.bisect_left(block, entry)
+            if position < len(block) and block[position] == entry:
+                del block[position]
+                self.bits[i] ^= 1 << entry[2]
+                self.count -= 1
+                if block:
+                    self.firsts[i] = block[0]
+                else:
+                    del self.blocks[i], self.bits[i], self.firsts[i]
+        self._rebalance()
+    
+    def _rebalance(self):
+        # Growth or deletions since the last rebuild left too many (or too small) blocks
+        if len(self.blocks) > max(512, 4 * self.count // self.block_size):
+            self.rebuild(list(self))
+    
+    def position(self, key):
+        """Number of entries sorting before key"""
+        i = bisect.bisect_left(self.firsts, key) - 1
+        if i < 0:
+            return 0
+        return sum(map(len, self.blocks[:i])) + bisect.bisect_left(self.blocks[i], key)
+    
+    def slice(self, start, stop):
+        """Entries at positions [start, stop)"""
+        entries = []
+        offset = 0
+        for block in self.blocks:
+            end = offset + len(block)
+            if end > start:
+                entries.extend(block[max(start - offset, 0):stop - offset])
+            if end >= stop:
+                break
+            offset = end
+        return entries
+    
+    def bits_between(self, low, high):
+        """Bitmap of the slots whose entries fall in [low, high); None leaves that side open"""
+        first = 0 if low is None else max(bisect.bisect_right(self.firsts, low) - 1, 0)
+        last = len(self.blocks) if high is None else bisect.bisect_left(self.firsts, high)
+        bits = 0
+        for i in range(first, last):
+            block = self.blocks[i]
+            if (low is None or block[0] >= low) and (high is None or block[-1] < high):
+                bits |= self.bits[i]
+            else:
+                start = 0 if low is None else bisect.bisect_left(block, low)
+                stop = len(block) if high is None else bisect.bisect_left(block, high)
+                bits |= slot_bits(entry[2] for entry in block[start:stop])
+        return bits
+    
+    def first(self, count, skip, mask, flags, descending=False):
+        """Ids of up to count entries whose slot is set in mask, after skipping skip of them
+
+        flags is mask as little-endian bytes covering every slot, for cheap per-entry tests.
+        """
+        ids = []
+        order = range(len(self.blocks) - 1, -1, -1) if descending else range(len(self.blocks))
+        for i in order:
+            hits = self.bits[i] & mask
+            if not hits:
+                continue
+            if skip:
+                found = hits.bit_count()
+                if found <= skip:
+                    skip -= found
+                    continue
+            block = self.blocks[i]
+            for _, task_id, slot in reversed(block) if descending else block:
+                if flags[slot >> 3] >> (slot & 7) & 1:
+                    if skip:
+                        skip -= 1
+                        continue
+                    ids.append(task_id)
+                    if len(ids) == count:
+                        return ids
+        return ids
+
+class TaskSearchIndex:
+    """Inverted token index over active tasks' title and description, with sorted time and title indexes
+
+    Every indexed task holds a slot number. Statuses, word prefixes shared
+    by many tasks and the sorted index blocks keep bitmaps over slots, so
+    filters combine with & and totals come from bit_count() rather than
+    from building sets of ids.
+    """
+    # Batches larger than this re-sort the vocabulary instead of inserting token by token
+    BULK = 64
+    SORT_COLUMNS = ('reminder_time', 'title', 'status')
+    # Searches with at most this many matches sort them instead of walking a sorted index
+    SELECT = 4096
+    # Word prefixes matching this many tasks, or 1/32 of the index, keep a bitmap
+    DENSE = 4096
+    
+    def __init__(self):
+        self.postings: Dict[str, set] = {}
+        self.vocabulary: List[str] = []
+        # Bitmaps of the word prefixes shared by many tasks, kept current on every update
+        self.dense: Dict[str, int] = {}
+        self.by_time = SortedBlocks()
+        self.by_title = SortedBlocks()
+        self.status_bits: Dict[str, int] = {status: 0 for status in STATUS_ORDER}
+        # Slots freed by removed tasks are reused, so bitmaps stay as wide as the index
+        self.slot_of: Dict[str, int] = {}
+        self.id_at: List[Optional[str]] = []
+        self.free_slots: List[int] = []
+        # Per-task keys, kept in plain dicts so sorts can use dict.__getitem__
+        self.tokens_of: Dict[str, set] = {}
+        self.time_of: Dict[str, str] = {}
+        self.title_of: Dict[str, str] = {}
+        self.status_of: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.status_of)
+    
+    @staticmethod
+    def tokens(text):
+        return set(SEARCH_TOKEN.findall(text.casefold()))
+    
+    def _is_bulk(self, count):
+        # Large batches rebuild the prefix bitmaps rather than patch them task by task
+        return count > max(self.BULK, len(self.status_of) // 8)
+    
+    def update(self, tasks):
+        """Index new or changed tasks; inactive tasks drop out of the index"""
+        tasks = list(tasks)
+        if tasks:
+            with self._lock:
+                # Fired and completed tasks usually change status only
+                restatus = []
+                moved = []
+                for task in tasks:
+                    if task.is_active and task.id in self.status_of and self._same_keys(task):
+                        restatus.append(task)
+                    else:
+                        moved.append(task)
+                self._restatus(restatus)
+                bulk = self._is_bulk(len(moved))
+                self._unlink([task.id for task in moved], bulk)
+                self._link([task for task in moved if task.is_active], bulk)
+                if bulk:
+                    self._build_dense()
+    
+    def _same_keys(self, task):
+        task_id = task.id
+        return (self.time_of[task_id] == task.reminder_iso() and self.title_of[task_id] == task.title.casefold()
+                and self.tokens_of[task_id] == self.tokens(task.title + " " + task.description))
+    
+    def _restatus(self, tasks):
+        """Move tasks whose time, title and tokens are unchanged to their new status"""
+        removed = {status: [] for status in STATUS_ORDER}
+        added = {status: [] for status in STATUS_ORDER}
+        for task in tasks:
+            task_id = task.id
+            status = task_status(task)
+            previous = self.status_of[task_id]
+            if status != previous:
+                self.status_of[task_id] = status
+                removed[previous].append(self.slot_of[task_id])
+                added[status].append(self.slot_of[task_id])
+        self._set_status_bits(removed, added)
+    
+    def _set_status_bits(self, removed, added):
+        for status in STATUS_ORDER:
+            if removed[status]:
+                self.status_bits[status] &= ~slot_bits(removed[status])
+            if added[status]:
+                self.status_bits[status] |= slot_bits(added[status])
+    
+    def remove(self, task_ids):
+        task_ids = list(task_ids)
+        if task_ids:
+            with self._lock:
+                bulk = self._is_bulk(len(task_ids))
+                self._unlink(task_ids, bulk)
+                if bulk:
+                    self._build_dense()
+    
+    def _dense_prefixes(self, tokens, slot, changed):
+        """Add slot under every dense prefix of tokens"""
+        dense = self.dense
+        for token in tokens:
+            for end in range(1, len(token) + 1):
+                prefix = token[:end]
+                if prefix in dense:
+                    changed.setdefault(prefix, []).append(slot)
+    
+    def _link(self, tasks, bulk):
+        new_tokens = []
+        time_entries = []
+        title_entries = []
+        status_slots = {status: [] for status in STATUS_ORDER}
+        dense_slots = {}
+        for task in tasks:
+            task_id = task.id
+            if self.free_slots:
+                slot = self.free_slots.pop()
+                self.id_at[slot] = task_id
+            else:
+                slot = len(self.id_at)
+                self.id_at.append(task_id)
+            self.slot_of[task_id] = slot
+            tokens = self.tokens(task.title + " " + task.description)
+            for token in tokens:
+                ids = self.postings.get(token)
+                if ids is None:
+                    ids = self.postings[token] = set()
+                    new_tokens.append(token)
+                ids.add(task_id)
+            if not bulk and self.dense:
+                self._dense_prefixes(tokens, slot, dense_slots)
+            # ISO text sorts chronologically and avoids decoding lazy reminder times
+            moment = task.reminder_iso()
+            title = task.title.casefold()
+            status = task_status(task)
+            self.tokens_of[task_id] = tokens
+            self.time_of[task_id] = moment
+            self.title_of[task_id] = title
+            self.status_of[task_id] = status
+            status_slots[status].append(slot)
+            time_entries.append((moment, task_id, slot))
+            title_entries.append((title, task_id, slot))
+        
+        self._insert_sorted(self.vocabulary, new_tokens)
+        self.by_time.insert(time_entries)
+        self.by_title.insert(title_entries)
+        self._set_status_bits({status: () for status in STATUS_ORDER}, status_slots)
+        for prefix, slots in dense_slots.items():
+            self.dense[prefix] |= slot_bits(slots)
+    
+    def _unlink(self, task_ids, bulk):
+        emptied = []
+        time_entries = []
+        title_entries = []
+        status_slots = {status: [] for status in STATUS_ORDER}
+        dense_slots = {}
+        freed = []
+        for task_id in task_ids:
+            status = self.status_of.pop(task_id, None)
+            if status is None:
+                continue
+            slot = self.slot_of.pop(task_id)
+            self.id_at[slot] = None
+            freed.append(slot)
+            tokens = self.tokens_of.pop(task_id)
+            for token in tokens:
+                ids = self.postings[token]
+                ids.discard(task_id)
+                if not ids:
+                    del self.postings[token]
+                    emptied.append(token)
+            if not bulk and self.dense:
+                self._dense_prefixes(tokens, slot, dense_slots)
+            status_slots[status].append(slot)
+            time_entries.append((self.time_of.pop(task_id), task_id, slot))
+            title_entries.append((self.title_of.pop(task_id), task_id, slot))
+        
+        self._remove_sorted(self.vocabulary, emptied)
+        self.by_time.remove(time_entries)
+        self.by_title.remove(title_entries)
+        self._set_status_bits(status_slots, {status: () for status in STATUS_ORDER})
+        for prefix, slots in dense_slots.items():
+            self.dense[prefix] &= ~slot_bits(slots)
+        self.free_slots.extend(freed)
+    
+    def _insert_sorted(self, keys, new_keys):
+        if len(new_keys) > self.BULK:
+            # Two sorted runs: timsort merges them in linear time
+            new_keys.sort()
+            keys.extend(new_keys)
+            keys.sort()
+        else:
+            for key in new_keys:
+                bisect.insort(keys, key)
+    
+    def _remove_sorted(self, keys, old_keys):
+        if len(old_keys) > self.BULK:
+            dropped = set(old_keys)
+            keys[:] = [key for key in keys if key not in dropped]
+        else:
+            for key in old_keys:
+                position = bisect.bisect_left(keys, key)
+                if position < len(keys) and keys[position] == key:
+                    del keys[position]
+    
+    def _dense_threshold(self):
+        return max(self.DENSE, len(self.status_of) // 32)
+    
+    def _posting_bits(self, tokens):
+        return slot_bits(map(self.slot_of.__getitem__,
+                             itertools.chain.from_iterable(self.postings[token] for token in tokens)))
+    
+    def _build_dense(self):
+        """Rebuild the bitmaps of every word prefix at or above the dense threshold"""
+        vocabulary = self.vocabulary
+        threshold = self._dense_threshold()
+        # mass[i:j] difference = postings held by vocabulary[i:j]
+        mass = [0]
+        mass.extend(itertools.accumulate(len(self.postings[token]) for token in vocabulary))
+        
+        # Find dense prefixes top down; a prefix's tokens are a contiguous vocabulary range
+        found = []
+        children = {}
+        pending = [("", 0, len(vocabulary))]
+        while pending:
+            prefix, low, high = pending.pop()
+            depth = len(prefix)
+            position = low
+            while position < high:
+                if len(vocabulary[position]) == depth:
+                    position += 1
+                    continue
+                child = vocabulary[position][:depth + 1]
+                end = bisect.bisect_left(vocabulary, child + MAX_CHAR, position, high)
+                if mass[end] - mass[position] >= threshold:
+                    found.append((child, position, end))
+                    children.setdefault(prefix, []).append((child, position, end))
+                    pending.append((child, position, end))
+                position = end
+        
+        # Build bottom up: a prefix ORs its dense children and reads only the other tokens
+        dense = {}
+        for prefix, low, high in sorted(found, key=lambda entry: -len(entry[0])):
+            bits = 0
+            loose = []
+            position = low
+            for child, child_low, child_high in sorted(children.get(prefix, ()), key=lambda entry: entry[1]):
+                bits |= dense[child]
+                loose.extend(vocabulary[position:child_low])
+                position = child_high
+            loose.extend(vocabulary[position:high])
+            dense[prefix] = bits | self._posting_bits(loose)
+        self.dense = dense
+    
+    def _prefix_bits(self, prefix):
+        """Bitmap of the tasks with a token starting with prefix"""
+        bits = self.dense.get(prefix)
+        if bits is None:
+            start = bisect.bisect_left(self.vocabulary, prefix)
+            end = bisect.bisect_left(self.vocabulary, prefix + MAX_CHAR, start)
+            tokens = self.vocabulary[start:end]
+            bits = self._posting_bits(tokens)
+            if sum(len(self.postings[token]) for token in tokens) >= self._dense_threshold():
+                # Grew past the threshold since the last rebuild; keep it current from now on
+                self.dense[prefix] = bits
+        return bits
+    
+    def _first(self, ordered, bits, size, skip, count, descending):
+        """The ids of a filtered group at [skip, skip + count) in ordered's order"""
+        if size <= self.SELECT:
+            # Few matches: sorting them beats walking an index they are sparse in
+            key_of = self.title_of if ordered is self.by_title else self.time_of
+            pairs = [(key_of[task_id], task_id) for task_id in map(self.id_at.__getitem__, bit_slots(bits))]
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            return [task_id for _, task_id in pick(skip + count, pairs)][skip:]
+        flags = bits.to_bytes((len(self.id_at) + 7) >> 3, 'little')
+        return ordered.first(count, skip, bits, flags, descending)
+    
+    def search_page(self, text="", start=None, end=None, statuses=None, sort_by='reminder_time',
+                    descending=False, offset=0, limit=None):
+        """(total, ids) for the page [offset, offset + limit) of a search, ordering only what the page needs"""
+        if sort_by not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort tasks by {sort_by!r}")
+        
+        with METRICS.timer('task_search_seconds'), self._lock:
+            # None matches every indexed task
+            mask = None
+            for prefix in self.tokens(text):
+                bits = self._prefix_bits(prefix)
+                mask = bits if mask is None else mask & bits
+                if not mask:
+                    return 0, []
+            if statuses is not None and not set(statuses).issuperset(STATUS_ORDER):
+                bits = 0
+                for status in statuses:
+                    bits |= self.status_bits.get(status, 0)
+                mask = bits if mask is None else mask & bits
+            
+            low = None if start is None else (start.isoformat(),)
+            high = None if end is None else (end.isoformat(),)
+            if mask is None and sort_by == 'reminder_time':
+                # Every task in the range matches: read the page straight off the time index
+                first = 0 if low is None else self.by_time.position(low)
+                last = len(self.by_time) if high is None else self.by_time.position(high)
+                total = max(last - first, 0)
+                count = total - offset if limit is None else min(limit, total - offset)
+                if count <= 0:
+                    return total, []
+                if descending:
+                    entries = self.by_time.slice(last - offset - count, last - offset)[::-1]
+                else:
+                    entries = self.by_time.slice(first + offset, first + offset + count)
+                return total, [task_id for _, task_id, _ in entries]
+            if low is not None or high is not None:
+                bits = self.by_time.bits_between(low, high)
+                mask = bits if mask is None else mask & bits
+            
+            ordered = self.by_title if sort_by == 'title' else self.by_time
+            if sort_by == 'status':
+                # Status groups in STATUS_ORDER, each in reminder-time order
+                groups = [bits if mask is None else mask & bits
+                          for bits in (self.status_bits[status] for status in STATUS_ORDER)]
+            else:
+                groups = [mask]
+            if descending:
+                groups.reverse()
+            sizes = [len(self) if bits is None else bits.bit_count() for bits in groups]
+            
+            total = sum(sizes)
+            wanted = total - offset if limit is None else min(limit, total - offset)
+            ids = []
+            skip = offset
+            for bits, size in zip(groups, sizes):
+                if len(ids) >= wanted:
+                    break
+                if skip >= size:
+                    skip -= size
+                    continue
+                count = wanted - len(ids)
+                if bits is None:
+                    # Title order over the whole index
+                    entries = (ordered.slice(size - skip - count, size - skip)[::-1] if descending
+                               else ordered.slice(skip, skip + count))
+                    ids.extend(task_id for _, task_id, _ in entries)
+                else:
+                    ids.extend(self._first(ordered, bits, size, skip, count, descending))
+                skip = 0
+        return total, ids
+    
+    def search(self, text="", start=None, end=None, statuses=None, sort_by='reminder_time',
+               descending=False) -> List[str]:
+        """Ids of active tasks whose tokens start with every word of text, due in [start, end), in sort order"""
+        return self.search_page(text, start, end, statuses, sort_by, descending)[1]
+
+class NotificationCoalescer:
+    """Groups due reminders by channel and recipient so each group is delivered once
+
+    With a window of 0 groups are flushed at the end of every scheduler
+    tick; otherwise the first reminder of a group starts a timer and
+    everything for that recipient arriving within the window is batched.
+    """
+    def __init__(self, dispatcher, window=0.0):
+        self.dispatcher = dispatcher
+        self.window = window
+        self.pending: Dict[tuple, List[Task]] = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        
+    def add(self, channel, recipient, task):
+        with self._lock:
+            self.pending.setdefault((channel, recipient), []).append(task)
+            if self.window > 0 and self._timer is None:
+                self._timer = threading.Timer(self.window, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+    
+    def end_tick(self):
+        if self.window <= 0:
+            self.flush()
+    
+    def flush(self):
+        with self._lock:
+            pending, self.pending = self.pending, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for (channel, recipient), tasks in pending.items():
+            self.dispatcher.submit(channel, tasks)
+
+class RWLock:
+    """Readers-writer lock: many readers at once or one writer; waiting writers go first
+
+    The writer may re-enter write() and read() on its own thread.
+    """
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None
+        self._write_depth = 0
+        self._writers_waiting = 0
+    
+    @contextmanager
+    def read(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                owned = True
+            else:
+                owned = False
+                while self._writer is not None or self._writers_waiting:
+                    self._condition.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            if not owned:
+                with self._condition:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._condition.notify_all()
+    
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me:
+                self._writers_waiting += 1
+                while self._writer is not None or self._readers:
+                    self._condition.wait()
+                self._writers_waiting -= 1
+                self._writer = me
+            self._write_depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+class ReminderScheduler:
+    """Sleeps until the earliest pending reminder is due instead of polling"""
+    # Upper bound on a single wait so wall-clock adjustments are picked up
+    MAX_WAIT = 3600.0
+    
+    def __init__(self, due_index, callback):
+        self.due_index = due_index
+        self.callback = callback
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+    
+    def schedule(self, task):
+        with self.condition:
+            previous = self.due_index.peek()
+            self.due_index.push(task)
+            if previous is None or task.reminder_time < previous:
+                self.condition.notify_all()
+    
+    def cancel(self, task_id):
+        with self.condition:
+            previous = self.due_index.peek()
+            self.due_index.discard(task_id)
+            if self.due_index.peek() != previous:
+                self.condition.notify_all()
+    
+    def schedule_many(self, tasks):
+        with self.condition:
+            for task in tasks:
+                self.due_index.push(task)
+            self.condition.notify_all()
+    
+    def rebuild(self, tasks):
+        with self.condition:
+            self.due_index.rebuild(tasks)
+            self.condition.notify_all()
+    
+    def pop_due(self, now) -> List[Task]:
+        with self.condition:
+            return self.due_index.pop_due(now)
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                if not self.running:
+                    return
+                deadline = self.due_index.peek()
+                if deadline is None:
+                    self.condition.wait()
+                    continue
+                delay = (deadline - datetime.now()).total_seconds()
+                if delay > 0:
+                    self.condition.wait(min(delay, self.MAX_WAIT))
+                    continue
+            
+            try:
+                self.callback()
+            except Exception as e:
+                print(f"Error processing reminders: {str(e)}")
+
+def task_to_dict(task):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'reminder_time': task.reminder_iso(),
+        'email': task.email,
+        'phone': task.phone,
+        'is_completed': task.is_completed,
+        'is_active': task.is_active,
+        'recurrence': task.recurrence
+    }
+
+def task_from_dict(task_data, lazy=False):
+    if lazy:
+        return Task.lazy(task_data)
+    return Task(
+        id=task_data['id'],
+        title=task_data['title'],
+        description=task_data['description'],
+        reminder_time=datetime.fromisoformat(task_data['reminder_time']),
+        email=task_data['email'],
+        phone=task_data['phone'],
+        is_completed=task_data.get('is_completed', False),
+        is_active=task_data.get('is_active', True),
+        recurrence=task_data.get('recurrence', '')
+    )
+
+_ARRAY_SEPARATOR = re.compile(r'[\s,]*')
+
+def iter_json_array(path, chunk_size=1 << 20) -> Iterator[dict]:
+    """Yield the objects of a top-level JSON array without loading the whole file"""
+    decode = json.JSONDecoder().raw_decode
+    skip_separator = _ARRAY_SEPARATOR.match
+    with open(path, 'r') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer:
+            return
+        if buffer[0] != '[':
+            raise ValueError(f"{path} does not contain a JSON array")
+        pos = 1
+        eof = False
+        while True:
+            pos = skip_separator(buffer, pos).end()
+            try:
+                task_data, pos = decode(buffer, pos)
+            except ValueError:
+                if pos < len(buffer) and buffer[pos] == ']':
+                    return
+                # The next element straddles the chunk boundary
+                if eof:
+                    raise ValueError(f"{path} ends with an incomplete JSON array")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+            yield task_data
+
+class TaskStore(ABC):
+    """Storage backend interface used by TaskReminderSystem"""
+    @abstractmethod
+    def load(self) -> Iterable[dict]:
+        """Return the task records the application keeps in memory"""
+    
+    @abstractmethod
+    def max_task_id(self) -> Optional[int]:
+        """Return the highest numeric task id ever stored, or None"""
+    
+    def read_header(self) -> Optional[dict]:
+        """Return {'max_id', 'next_due'} without loading tasks, or None if unknown"""
+        return None
+    
+    def save_header(self, max_id, next_due):
+        pass
+    
+    @abstractmethod
+    def write(self, tasks=(), deleted_ids=()):
+        """Persist changed tasks and remove deleted ones"""
+    
+    def size(self) -> int:
+        """Bytes the store occupies on disk"""
+        return 0
+    
+    def needs_compaction(self, task_count):
+        return False
+    
+    def compact(self, tasks):
+        """Make the store reflect every task in tasks"""
+        self.write(tasks)
+    
+    def close(self):
+        pass
+
+class JournalTaskStore(TaskStore):
+    """JSON snapshot plus an append-only journal with one record per mutation"""
+    # Compact once the journal holds this many records and outgrows the snapshot
+    COMPACT_THRESHOLD = 1000
+    
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.header_path = path + ".meta"
+        self.journal_records = 0
+        self._journal = None
+        self._max_id = None
+        
+    def load(self) -> Iterator[dict]:
+        """Yield task records from the snapshot with the journal replayed on top
+
+        The snapshot is streamed record by record; only the journal is held
+        in memory. max_task_id() is valid once the iterator is exhausted.
+        """
+        # Read the journal now so later appends cannot race the replay
+        return self._stream(self._read_journal())
+    
+    def _stream(self, overrides):
+        max_id = -1
+        if os.path.exists(self.path):
+            for task_data in iter_json_array(self.path):
+                if overrides and task_data['id'] in overrides:
+                    task_data = overrides.pop(task_data['id'])
+                    if task_data is None:
+                        continue
+                task_id = int(task_data['id'])
+                if task_id > max_id:
+                    max_id = task_id
+                yield task_data
+        
+        for task_data in overrides.values():
+            if task_data is not None:
+                max_id = max(max_id, int(task_data['id']))
+                yield task_data
+        self._max_id = max_id if max_id >= 0 else None
+    
+    def _read_journal(self):
+        """Return the final journaled record per task id (None if deleted)"""
+        overrides = {}
+        self.journal_records = 0
+        if not os.path.exists(self.journal_path):
+            return overrides
+        
+        valid_bytes = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record['op'] == 'put':
+                    overrides[record['task']['id']] = record['task']
+                elif record['op'] == 'delete':
+                    overrides[record['id']] = None
+                self.journal_records += 1
+                valid_bytes += len(line)
+        
+        # Drop a torn final record left by a crash mid-append so that
+        # new records start on a clean line
+        if valid_bytes < os.path.getsize(self.journal_path):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return overrides
+    
+    def max_task_id(self):
+        return self._max_id
+    
+    def _file_sizes(self):
+        sizes = {}
+        for key, path in (('snapshot', self.path), ('journal', self.journal_path)):
+            sizes[key] = os.path.getsize(path) if os.path.exists(path) else 0
+        return sizes
+    
+    def size(self):
+        return sum(self._file_sizes().values())
+    
+    def read_header(self):
+        # The sidecar is only trusted if nothing was written after it
+        try:
+            with open(self.header_path, 'r') as f:
+                header = json.load(f)
+            if self._journal is not None:
+                self._journal.flush()
+            if header['sizes'] != self._file_sizes():
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        next_due = header.get('next_due')
+        return {'max_id': header.get('max_id'),
+                'next_due': datetime.fromisoformat(next_due) if next_due else None}
+    
+    def save_header(self, max_id, next_due):
+        if self._journal is not None:
+            self._journal.flush()
+        header = {
+            'max_id': max_id,
+            'next_due': next_due.isoformat() if next_due else None,
+            'sizes': self._file_sizes()
+        }
+        tmp_path = self.header_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(header, f)
+        os.replace(tmp_path, self.header_path)
+    
+    def write(self, tasks=(), deleted_ids=()):
+        lines = [json.dumps({'op': 'put', 'task': task_to_dict(task)}) for task in tasks]
+        lines.extend(json.dumps({'op': 'delete', 'id': task_id}) for task_id in deleted_ids)
+        if not lines:
+            return
+        
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a')
+        payload = "\n".join(lines) + "\n"
+        self._journal.write(payload)
+        self._journal.flush()
+        self.journal_records += len(lines)
+        METRICS.inc('task_journal_bytes_total', len(payload))
+    
+    def needs_compaction(self, task_count):
+        return self.journal_records >= max(self.COMPACT_THRESHOLD, task_count)
+    
+    def compact(self, tasks):
+        """Write a fresh snapshot atomically, then truncate the journal"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump([task_to_dict(task) for task in tasks], f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        
+        # Replaying a stale journal over the new snapshot is harmless, so a
+        # crash between the rename and the truncate loses nothing
+        self.close()
+        open(self.journal_path, 'w').close()
+        self.journal_records = 0
+    
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+class SQLiteTaskStore(TaskStore):
+    """SQLite (WAL mode) task table, indexed for the active-task load and the next-due header"""
+    COLUMNS = ('id', 'title', 'description', 'reminder_time', 'email', 'phone',
+               'is_completed', 'is_active', 'recurrence')
+    
+    def __init__(self, path, migrate_from=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id TEXT PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    description TEXT NOT NULL,
+                    reminder_time TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    phone TEXT NOT NULL,
+                    is_completed INTEGER NOT NULL DEFAULT 0,
+                    is_active INTEGER NOT NULL DEFAULT 1,
+                    recurrence TEXT NOT NULL DEFAULT ''
+                )""")
+            columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(tasks)")}
+            if 'recurrence' not in columns:
+                # Databases created before recurring reminders
+                self.conn.execute("ALTER TABLE tasks ADD COLUMN recurrence TEXT NOT NULL DEFAULT ''")
+            # One index serves the active-task load and the next-due header;
+            # a reminder_time-only index was never chosen and only slowed writes
+            self.conn.execute("DROP INDEX IF EXISTS idx_tasks_reminder_time")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status "
+                              "ON tasks(is_active, is_completed, reminder_time)")
+        
+        if migrate_from:
+            self.migrate_from_json(migrate_from)
+    
+    def migrate_from_json(self, json_path):
+        """Import an existing tasks.json (and its journal) once, into an empty table"""
+        source = JournalTaskStore(json_path)
+        if not (os.path.exists(source.path) or os.path.exists(source.journal_path)):
+            return
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone():
+                return
+            rows = [self._row(task_from_dict(task_data)) for task_data in source.load()]
+            with self.conn:
+                self.conn.executemany(self._upsert_sql(), rows)
+        
+        for path in (source.path, source.journal_path):
+            if os.path.exists(path):
+                os.replace(path, path + ".migrated")
+        print(f"Migrated {len(rows)} tasks from {json_path} to {self.path}")
+    
+    def _upsert_sql(self):
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in self.COLUMNS[1:])
+        return (f"INSERT INTO tasks ({', '.join(self.COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}")
+    
+    def _row(self, task):
+        return (task.id, task.title, task.description, task.reminder_iso(),
+                task.email, task.phone, int(task.is_completed), int(task.is_active), task.recurrence)
+    
+    def _record(self, row):
+        task_data = dict(row)
+        task_data['is_completed'] = bool(task_data['is_completed'])
+        task_data['is_active'] = bool(task_data['is_active'])
+        return task_data
+    
+    def load(self) -> Iterator[dict]:
+        """Yield active records straight from the cursor
+
+        The rows are read over a connection of their own, from one WAL
+        snapshot, so the load can run on a background thread while writes
+        go through self.conn.
+        """
+        # Inactive tasks are history only; they stay on disk
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            for row in conn.execute("SELECT * FROM tasks WHERE is_active = 1 ORDER BY rowid"):
+                yield self._record(row)
+        finally:
+            conn.close()
+    
+    def max_task_id(self):
+        with self._lock:
+            row = self.conn.execute("SELECT MAX(CAST(id AS INTEGER)) FROM tasks").fetchone()
+        return row[0]
+    
+    def read_header(self):
+        with self._lock:
+            row = self.conn.execute("SELECT MIN(reminder_time) FROM tasks "
+                                    "WHERE is_active = 1 AND is_completed = 0").fetchone()
+        return {'max_id': self.max_task_id(),
+                'next_due': datetime.fromisoformat(row[0]) if row[0] else None}
+    
+    def write(self, tasks=(), deleted_ids=()):
+        rows = [self._row(task) for task in tasks]
+        deleted = [(task_id,) for task_id in deleted_ids]
+        if not rows and not deleted:
+            return
+        with self._lock, self.conn:
+            if rows:
+                self.conn.executemany(self._upsert_sql(), rows)
+            if deleted:
+                self.conn.executemany("DELETE FROM tasks WHERE id = ?", deleted)
+    
+    def size(self):
+        return sum(os.path.getsize(path) for path in (self.path, self.path + "-wal") if os.path.exists(path))
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+# Errors the server replied with; every smtplib error is also an OSError
+SMTP_REPLY_ERRORS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
+
+class SMTPConnectionPool:
+    """Reusable authenticated SMTP sessions shared by reminder emails"""
+    def __init__(self, server, port, username, password, size=2, keepalive=30.0,
+                 max_idle=240.0, use_tls=True, timeout=30):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.keepalive = keepalive
+        self.max_idle = max_idle
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        
+    def _connect(self):
+        with METRICS.timer('smtp_connect_seconds'):
+            conn = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    conn.starttls()
+                if self.username:
+                    conn.login(self.username, self.password)
+            except Exception:
+                conn.close()
+                raise
+        return conn
+    
+    def _is_alive(self, conn):
+        try:
+            return conn.noop()[0] == 250
+        except OSError:
+            return False
+    
+    def _discard(self, conn):
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+    
+    def _checkout(self):
+        with self._lock:
+            conn, last_used = self._idle.pop() if self._idle else (None, 0.0)
+        if conn is not None:
+            idle_for = time.monotonic() - last_used
+            # Servers drop long-idle sessions; probe with NOOP before reuse
+            if idle_for > self.max_idle or (idle_for > self.keepalive and not self._is_alive(conn)):
+                self._discard(conn)
+                conn = None
+        return conn or self._connect()
+    
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except SMTP_REPLY_ERRORS:
+            # The server answered and smtplib reset the transaction, so the session stays pooled
+            raise
+        except (smtplib.SMTPServerDisconnected, OSError):
+            if conn is not None:
+                conn.close()
+                conn = None
+            raise
+        finally:
+            # smtplib closes the socket itself on a 421 reply
+            if conn is not None and conn.sock is not None:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+            self._slots.release()
+    
+    def send_many(self, messages):
+        """Send (sender, recipient, text) tuples over one session, reconnecting once on a drop"""
+        pending = list(messages)
+        for attempt in range(2):
+            try:
+                with self.connection() as conn:
+                    while pending:
+                        sender, recipient, text = pending[0]
+                        with METRICS.timer('smtp_send_seconds'):
+                            conn.sendmail(sender, recipient, text)
+                        pending.pop(0)
+                return
+            except SMTP_REPLY_ERRORS:
+                # A refused message fails the same way on a fresh session
+                raise
+            except (smtplib.SMTPServerDisconnected, OSError):
+                if attempt:
+                    raise
+    
+    def send(self, sender, recipient, text):
+        self.send_many([(sender, recipient, text)])
+    
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._discard(conn)
+
+@dataclass
+class NotificationJob:
+    channel: str
+    tasks: List[Task]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+class NotificationDispatcher:
+    """Bounded per-channel queues drained by worker threads, with retry and dead-lettering"""
+    def __init__(self, handlers: Dict[str, Callable], concurrency=None, queue_size=1000,
+                 max_retries=3, backoff=1.0, max_backoff=60.0):
+        self.handlers = handlers
+        self.concurrency = concurrency or {}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.queues = {channel: queue.Queue(maxsize=queue_size) for channel in handlers}
+        self.dead_letters = deque(maxlen=1000)
+        self.stats = {channel: {'sent': 0, 'failed': 0, 'retried': 0, 'dead': 0,
+                                'latency_total': 0.0, 'latency_max': 0.0}
+                      for channel in handlers}
+        self._stats_lock = threading.Lock()
+        self._workers = []
+        self.running = False
+        
+    def start(self):
+        self.running = True
+        for channel in self.handlers:
+            for _ in range(self.concurrency.get(channel, 1)):
+                worker = threading.Thread(target=self._work, args=(channel,), daemon=True)
+                worker.start()
+                self._workers.append(worker)
+    
+    def stop(self, timeout=5.0):
+        self.running = False
+        for channel, channel_queue in self.queues.items():
+            for _ in range(self.concurrency.get(channel, 1)):
+                try:
+                    channel_queue.put(None, timeout=timeout)
+                except queue.Full:
+                    pass
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+    
+    def submit(self, channel, tasks, timeout=1.0):
+        """Queue one notification covering tasks; returns False if it was dead-lettered instead"""
+        return self._enqueue(NotificationJob(channel, tasks), timeout)
+    
+    def _enqueue(self, job, timeout=1.0):
+        try:
+            self.queues[job.channel].put(job, timeout=timeout)
+            return True
+        except queue.Full:
+            self._dead_letter(job, "queue full")
+            return False
+    
+    def _dead_letter(self, job, reason):
+        self.dead_letters.append((job, reason))
+        with self._stats_lock:
+            self.stats[job.channel]['dead'] += 1
+        print(f"Dropped {job.channel} notification for {len(job.tasks)} reminder(s): {reason}")
+    
+    def _work(self, channel):
+        handler = self.handlers[channel]
+        channel_queue = self.queues[channel]
+        while True:
+            job = channel_queue.get()
+            if job is None:
+                return
+            job.attempts += 1
+            try:
+                handler(job.tasks)
+            except Exception as e:
+                self._retry(job, e)
+                continue
+            
+            latency = time.monotonic() - job.enqueued_at
+            with self._stats_lock:
+                stats = self.stats[channel]
+                stats['sent'] += 1
+                stats['latency_total'] += latency
+                stats['latency_max'] = max(stats['latency_max'], latency)
+    
+    def _retry(self, job, error):
+        with self._stats_lock:
+            self.stats[job.channel]['failed'] += 1
+        if job.attempts > self.max_retries or not self.running:
+            self._dead_letter(job, str(error))
+            return
+        
+        delay = min(self.backoff * 2 ** (job.attempts - 1), self.max_backoff)
+        print(f"Failed to send {job.channel} notification ({str(error)}), retrying in {delay:.1f}s")
+        with self._stats_lock:
+            self.stats[job.channel]['retried'] += 1
+        # Requeue from a timer so the worker is free while backing off
+        timer = threading.Timer(delay, self._enqueue, args=(job,))
+        timer.daemon = True
+        timer.start()
+    
+    def metrics(self):
+        """Return queue depth, delivery counts and latency per channel"""
+        with self._stats_lock:
+            result = {}
+            for channel, stats in self.stats.items():
+                sent = stats['sent']
+                result[channel] = {
+                    'depth': self.queues[channel].qsize(),
+                    'sent': sent,
+                    'failed': stats['failed'],
+                    'retried': stats['retried'],
+                    'dead': stats['dead'],
+                    'latency_avg': stats['latency_total'] / sent if sent else 0.0,
+                    'latency_max': stats['latency_max']
+                }
+            return result
+
+def validate_task_input(title, date_str, time_str, now=None):
+    """Check add-task input and return the reminder datetime; raises ValueError with a user-facing message"""
+    if not title:
+        raise ValueError("Please enter a task title")
+    
+    if not date_str or not time_str:
+        raise ValueError("Please enter both date and time")
+    
+    try:
+        reminder_datetime = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        raise ValueError("Please enter valid date (YYYY-MM-DD) and time (HH:MM)")
+    
+    if reminder_datetime <= (now or datetime.now()):
+        raise ValueError("Reminder time must be in the future")
+    
+    return reminder_datetime
+
+EXPORT_FIELDS = ('id', 'title', 'description', 'date', 'time', 'email', 'phone',
+                 'recurrence', 'is_completed', 'is_active')
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+def iter_import_rows(path, fmt=None) -> Iterator[Tuple[Optional[dict], Optional[str]]]:
+    """Stream (row, error) pairs from a CSV file (with a header row) or a JSON Lines file
+
+    A row that does not decode comes back with row None and the reason,
+    so it is rejected on its own rather than ending the import.
+    """
+    if detect_format(path, fmt) == 'csv':
+        # CSV records can span lines, so bad bytes are kept and caught per row
+        with open(path, 'r', newline='', encoding='utf-8', errors='surrogateescape') as f:
+            for row in csv.DictReader(f):
+                try:
+                    "".join(value for value in row.values() if isinstance(value, str)).encode('utf-8')
+                except UnicodeEncodeError:
+                    yield None, "Not valid UTF-8"
+                    continue
+                yield row, None
+        return
+    
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line.decode('utf-8')), None
+            except UnicodeDecodeError:
+                yield None, "Not valid UTF-8"
+            except ValueError as e:
+                yield None, f"Invalid JSON: {str(e)}"
+
+def validate_import_row(row, now):
+    """Validate one import row like the add-task form; returns add_task() arguments"""
+    if not isinstance(row, dict):
+        raise ValueError(f"Expected an object, got {type(row).__name__}")
+    
+    def text(name):
+        # JSON Lines can carry numbers, lists or objects where text belongs
+        value = row.get(name) or ''
+        if not isinstance(value, str):
+            raise ValueError(f"Expected text for {name}, got {type(value).__name__}")
+        return value.strip()
+    
+    title = text('title')
+    date_str = text('date')
+    time_str = text('time')
+    if not date_str and row.get('reminder_time'):
+        # Accept ISO timestamps at the form's minute precision
+        date_str, _, time_str = text('reminder_time').partition('T')
+        time_str = time_str[:5]
+    reminder_datetime = validate_task_input(title, date_str, time_str, now=now)
+    return (title, text('description'), reminder_datetime, text('email'), text('phone'),
+            parse_recurrence(text('recurrence')))
+
+CATCHUP_POLICIES = ('fire-all', 'digest', 'skip')
+
+class ReminderEngine:
+    """Task storage, scheduling and notification delivery, independent of the GUI"""
+    def __init__(self, storage="json", data_file="tasks.json", settings_file="email_settings.json",
+                 desktop_notifier=None, background_load=False, on_loaded=None):
+        # Task storage, keyed by id in insertion order
+        self.tasks: Dict[str, Task] = {}
+        self.task_counter = 0
+        self.data_file = data_file
+        if storage == "sqlite":
+            self.store = SQLiteTaskStore(os.path.splitext(data_file)[0] + ".db", migrate_from=data_file)
+        else:
+            self.store = JournalTaskStore(data_file)
+        self.due_index = DueIndex()
+        self.scheduler = ReminderScheduler(self.due_index, self.process_reminders)
+        # Built on first use, so headless runs, shard workers and imports never pay for it
+        self._search_index = None
+        # Guards the task table; scans copy it under a read lock and iterate the copy
+        self.lock = RWLock()
+        # Serializes journal appends, compaction and header writes
+        self.store_lock = threading.RLock()
+        self.loaded = threading.Event()
+        self.on_loaded = on_loaded
+        self.header_next_due = None
+        
+        # Email configuration
+        self.settings_file = settings_file
+        self.smtp_server = "smtp.gmail.com"
+        self.smtp_port = 587
+        self.email_username = ""
+        self.email_password = ""
+        self.mail_pool = None
+        
+        # Seconds to collect reminders per recipient before sending a digest
+        self.coalesce_window = 0.0
+        
+        # Reminders that fell due while the app was down: how to deliver them,
+        # the age past which 'skip' drops them (hours), and the batch size
+        self.catchup_policy = 'digest'
+        self.catchup_max_age = 24.0
+        self.catchup_batch_size = 500
+        self.missed: List[Task] = []
+        self.last_catch_up: List[dict] = []
+        self.caught_up = threading.Event()
+        self.started = False
+        
+        # Notification delivery runs off the scheduler thread
+        self.desktop_notifier = desktop_notifier
+        self.dispatcher = NotificationDispatcher(
+            {'desktop': self.show_desktop_notification,
+             'email': self.send_email,
+             'sms': self.send_sms},
+            concurrency={'desktop': 1, 'email': 2, 'sms': 1}
+        )
+        
+        # Load existing data
+        self.load_email_settings()
+        self.coalescer = NotificationCoalescer(self.dispatcher, self.coalesce_window)
+        self.load_tasks(background=background_load)
+    
+    def start(self):
+        self.dispatcher.start()
+        self.scheduler.start()
+        METRICS.add_collector(self.collect_metrics)
+        self.started = True
+        self.start_catch_up()
+    
+    def stop(self):
+        self.scheduler.stop()
+        self.coalescer.flush()
+        self.dispatcher.stop()
+        METRICS.remove_collector(self.collect_metrics)
+        self.reset_mail_pool()
+        with self.store_lock:
+            if self.loaded.is_set():
+                self.save_header()
+            self.store.close()
+    
+    def collect_metrics(self) -> dict:
+        """Dispatcher queue depth, delivery counts and latency per channel, for METRICS"""
+        counters = {}
+        gauges = {}
+        for channel, stats in self.dispatcher.metrics().items():
+            gauges[metric_key('notification_queue_depth', channel=channel)] = stats['depth']
+            gauges[metric_key('notification_latency_avg_seconds', channel=channel)] = stats['latency_avg']
+            gauges[metric_key('notification_latency_max_seconds', channel=channel)] = stats['latency_max']
+            for stat, name in (('sent', 'notifications_sent_total'), ('failed', 'notifications_failed_total'),
+                               ('retried', 'notifications_retried_total'),
+                               ('dead', 'notifications_dead_lettered_total')):
+                counters[metric_key(name, channel=channel)] = stats[stat]
+        return {'counters': counters, 'gauges': gauges}
+    
+    def next_due(self) -> Optional[datetime]:
+        """Earliest pending reminder, answered from the header while still loading"""
+        if not self.loaded.is_set():
+            return self.header_next_due
+        with self.scheduler.condition:
+            return self.due_index.peek()
+    
+    def add_task(self, title, description, reminder_time, email="", phone="", recurrence=""):
+        task = Task(
+            id=str(self.task_counter),
+            title=title,
+            description=description,
+            reminder_time=reminder_time,
+            email=email,
+            phone=phone,
+            recurrence=recurrence
+        )
+        
+        with self.lock.write():
+            self.tasks[task.id] = task
+            self.task_counter += 1
+            self.scheduler.schedule(task)
+        self.persist_tasks([task])
+        return task
+    
+    def import_tasks(self, path, fmt=None, batch_size=5000):
+        """Bulk-add tasks from CSV or JSON Lines in one store write; returns (imported, errors)"""
+        now = datetime.now()
+        imported = []
+        errors = []
+        batch = []
+        
+        def flush(batch):
+            results = []
+            for line_number, row, error in batch:
+                if error is not None:
+                    errors.append((line_number, error))
+                    continue
+                try:
+                    results.append(validate_import_row(row, now))
+                except ValueError as e:
+                    errors.append((line_number, str(e)))
+            imported.extend(self.create_tasks(results))
+        
+        try:
+            for line_number, (row, error) in enumerate(iter_import_rows(path, fmt), start=1):
+                batch.append((line_number, row, error))
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            flush(batch)
+        finally:
+            # Index and persist the whole import at once, including batches
+            # created before a read error
+            self.scheduler.schedule_many(imported)
+            self.persist_tasks(imported)
+        return imported, errors
+    
+    def add_tasks(self, entries):
+        """Add (title, description, reminder_time, email, phone, recurrence) tuples in one store write"""
+        tasks = self.create_tasks(entries)
+        self.scheduler.schedule_many(tasks)
+        self.persist_tasks(tasks)
+        return tasks
+    
+    def create_tasks(self, entries) -> List[Task]:
+        """Assign ids and register tasks without indexing or persisting them"""
+        tasks = []
+        with self.lock.write():
+            for title, description, reminder_time, email, phone, recurrence in entries:
+                task = Task(
+                    id=str(self.task_counter),
+                    title=title,
+                    description=description,
+                    reminder_time=reminder_time,
+                    email=email,
+                    phone=phone,
+                    recurrence=recurrence
+                )
+                self.tasks[task.id] = task
+                self.task_counter += 1
+                tasks.append(task)
+        return tasks
+    
+    def export_tasks(self, path, fmt=None):
+        """Stream every task to CSV or JSON Lines; returns the number written"""
+        count = 0
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv_format = detect_format(path, fmt) == 'csv'
+            if csv_format:
+                writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+                writer.writeheader()
+            for task in self.snapshot():
+                reminder_time = task.reminder_time
+                row = {
+                    'id': task.id,
+                    'title': task.title,
+                    'description': task.description,
+                    'date': reminder_time.strftime("%Y-%m-%d"),
+                    'time': reminder_time.strftime("%H:%M"),
+                    'email': task.email,
+                    'phone': task.phone,
+                    'recurrence': task.recurrence,
+                    'is_completed': task.is_completed,
+                    'is_active': task.is_active
+                }
+                if csv_format:
+                    writer.writerow(row)
+                else:
+                    f.write(json.dumps(row) + "\n")
+                count += 1
+        return count
+    
+    def complete_tasks(self, tasks):
+        with self.lock.write():
+            for task in tasks:
+                task.is_completed = True
+                task.is_active = False
+                self.scheduler.cancel(task.id)
+        self.persist_tasks(tasks)
+    
+    def delete_tasks(self, tasks):
+        deleted_ids = []
+        with self.lock.write():
+            for task in tasks:
+                if self.tasks.pop(task.id, None) is not None:
+                    self.scheduler.cancel(task.id)
+                    deleted_ids.append(task.id)
+        self.persist_tasks(deleted_ids=deleted_ids)
+    
+    def get_tasks(self, task_ids) -> List[Task]:
+        """Look up tasks by id, skipping ids that no longer exist"""
+        with self.lock.read():
+            return [self.tasks[task_id] for task_id in task_ids if task_id in self.tasks]
+    
+    def snapshot(self) -> List[Task]:
+        """Copy of the task list for scans that must not hold up edits"""
+        with self.lock.read():
+            return list(self.tasks.values())
+    
+    def process_reminders(self):
+        with METRICS.timer('reminder_tick_seconds'):
+            self._process_due()
+    
+    def _process_due(self):
+        current_time = datetime.now()
+        fired = []
+        
+        with self.lock.write():
+            for task in self.scheduler.pop_due(current_time):
+                if task.is_active and not task.is_completed:
+                    if METRICS.enabled:
+                        METRICS.observe('reminder_lateness_seconds',
+                                        (current_time - task.reminder_time).total_seconds())
+                    if task.recurrence:
+                        # Notify with a copy; the series moves on to its next occurrence
+                        self.send_notification(replace(task))
+                        self.advance_recurrence(task, current_time)
+                    else:
+                        self.send_notification(task)
+                        # Mark as completed to avoid repeated notifications
+                        task.is_completed = True
+                    fired.append(task)
+        
+        # One digest per recipient and one journal append for the whole burst,
+        # outside the lock so edits are not held up by delivery or disk
+        self.coalescer.end_tick()
+        self.persist_tasks(fired)
+        METRICS.inc('reminders_fired_total', len(fired))
+        METRICS.set_gauge('pending_reminders', len(self.due_index))
+    
+    def advance_recurrence(self, task, now):
+        """Move a recurring task to its next occurrence, completing it when the series ends"""
+        try:
+            result = RecurrenceRule.parse(task.recurrence).advance(task.reminder_time, now)
+        except ValueError as e:
+            print(f"Invalid recurrence for task '{task.title}': {str(e)}")
+            result = None
+        
+        if result is None:
+            task.is_completed = True
+            return
+        task.reminder_time, rule = result
+        task.recurrence = str(rule)
+        self.scheduler.schedule(task)
+    
+    def notification_targets(self, task):
+        """(channel, recipient) pairs a reminder for task is delivered to"""
+        targets = [('desktop', None)]
+        if task.email and self.email_username and self.email_password:
+            targets.append(('email', task.email))
+        if task.phone:
+            targets.append(('sms', task.phone))
+        return targets
+    
+    def send_notification(self, task):
+        for channel, recipient in self.notification_targets(task):
+            self.coalescer.add(channel, recipient, task)
+    
+    def show_desktop_notification(self, tasks):
+        if self.desktop_notifier is not None:
+            self.desktop_notifier(tasks)
+        else:
+            for task in tasks:
+                print(f"Reminder: {task.title}")
+    
+    def send_sms(self, tasks):
+        # SMS would require additional services like Twilio
+        # For now, we'll just show the phone number in console
+        print(f"SMS Reminder to {tasks[0].phone}: {', '.join(task.title for task in tasks)}")
+    
+    def get_mail_pool(self):
+        if self.mail_pool is None:
+            self.mail_pool = SMTPConnectionPool(self.smtp_server, self.smtp_port,
+                                                self.email_username, self.email_password)
+        return self.mail_pool
+    
+    def reset_mail_pool(self):
+        """Drop pooled connections so the next send uses the current settings"""
+        if self.mail_pool is not None:
+            self.mail_pool.close()
+            self.mail_pool = None
+    
+    def build_email(self, tasks):
+        """Build one message for a recipient: a single reminder or a digest of several"""
+        task = tasks[0]
+        msg = MIMEMultipart()
+        msg['From'] = self.email_username
+        msg['To'] = task.email
+        
+        if len(tasks) > 1:
+            msg['Subject'] = f"Task Reminders: {len(tasks)} tasks due"
+            lines = [f"- {task.title} ({task.reminder_time.strftime('%Y-%m-%d %H:%M')})"
+                     + (f": {task.description}" if task.description else "")
+                     for task in tasks]
+            body = ("Hello!\n\nThese tasks are due:\n\n" + "\n".join(lines)
+                    + "\n\nBest regards,\nPersonal Task Reminder System\n")
+            msg.attach(MIMEText(body, 'plain'))
+            return msg
+        
+        msg['Subject'] = f"Task Reminder: {task.title}"
+        
+        body = f"""
+        Hello!
+        
+        This is a reminder for your task:
+        
+        Title: {task.title}
+        Description: {task.description}
+        Scheduled Time: {task.reminder_time.strftime('%Y-%m-%d %H:%M')}
+        
+        Best regards,
+        Personal Task Reminder System
+        """
+        
+        msg.attach(MIMEText(body, 'plain'))
+        return msg
+    
+    def send_email(self, tasks):
+        # Errors propagate so the dispatcher can retry or dead-letter
+        text = self.build_email(tasks).as_string()
+        self.get_mail_pool().send(self.email_username, tasks[0].email, text)
+        
+        print(f"Email sent successfully to {tasks[0].email}")
+    
+    def persist_tasks(self, tasks=(), deleted_ids=()):
+        """Journal changed and deleted tasks, compacting when the journal grows"""
+        try:
+            with self.store_lock:
+                # A task deleted since it was changed must not be written back;
+                # a delete journaled after this point still wins
+                tasks = [task for task in tasks if task.id in self.tasks]
+                # Every mutation passes through here, so a built search index stays current
+                if self._search_index is not None:
+                    self._search_index.update(tasks)
+                    self._search_index.remove(deleted_ids)
+                with METRICS.timer('task_journal_write_seconds'):
+                    self.store.write(tasks, deleted_ids)
+                # A snapshot taken before loading finishes would drop tasks
+                if self.loaded.is_set() and self.store.needs_compaction(len(self.tasks)):
+                    self.save_tasks()
+            METRICS.set_gauge('tasks', len(self.tasks))
+        except Exception as e:
+            print(f"Error saving tasks: {str(e)}")
+    
+    def save_tasks(self):
+        if not self.loaded.is_set():
+            return
+        try:
+            # Holding the store lock orders the snapshot against journal appends:
+            # a change journaled earlier is in the snapshot, a later one lands
+            # in the fresh journal
+            with self.store_lock:
+                with METRICS.timer('task_save_seconds'):
+                    self.store.compact(self.snapshot())
+                self.save_header()
+                if METRICS.enabled:
+                    METRICS.set_gauge('task_save_bytes', self.store.size())
+        except Exception as e:
+            print(f"Error saving tasks: {str(e)}")
+    
+    def save_header(self):
+        try:
+            with self.store_lock:
+                self.store.save_header(self.task_counter - 1 if self.task_counter else None, self.next_due())
+        except Exception as e:
+            print(f"Error saving task header: {str(e)}")
+    
+    def load_tasks(self, background=False):
+        """Load tasks, streaming them in a background thread when the store header allows it"""
+        header = self.store.read_header() if background else None
+        if header is None:
+            self._load_all()
+            return
+        
+        # The header gives the id counter and next deadline straight away
+        if header['max_id'] is not None:
+            self.task_counter = header['max_id'] + 1
+        self.header_next_due = header['next_due']
+        # Open the store here so journal replay happens before any new writes;
+        # SQLite rows are only read once the loader thread iterates them
+        records = self.store.load()
+        threading.Thread(target=self._load_all, args=(records,), daemon=True).start()
+    
+    def _load_all(self, records=None):
+        start = time.perf_counter()
+        try:
+            loaded = {}
+            for task_data in records if records is not None else self.store.load():
+                # Decode reminder times lazily; only pending tasks need them now
+                task = task_from_dict(task_data, lazy=True)
+                loaded[task.id] = task
+            
+            max_id = self.store.max_task_id()
+            with self.store_lock, self.lock.write():
+                # Keep tasks added while the load was running
+                loaded.update(self.tasks)
+                self.tasks = loaded
+                # An index built during the load saw only part of the table
+                self._search_index = None
+                if max_id is not None:
+                    self.task_counter = max(self.task_counter, max_id + 1)
+                self.scheduler.rebuild(loaded.values())
+                # Range query for everything already overdue; catch_up delivers it
+                self.missed = self.scheduler.pop_due(datetime.now())
+            
+            if METRICS.enabled:
+                METRICS.observe('task_load_seconds', time.perf_counter() - start)
+                METRICS.set_gauge('task_load_bytes', self.store.size())
+                METRICS.set_gauge('tasks', len(loaded))
+                METRICS.set_gauge('pending_reminders', len(self.due_index))
+                    
+        except Exception as e:
+            print(f"Error loading tasks: {str(e)}")
+        
+        self.loaded.set()
+        if self.on_loaded is not None:
+            self.on_loaded()
+        self.start_catch_up()
+    
+    @property
+    def search_index(self) -> TaskSearchIndex:
+        """Search index over the task table, built on the first search"""
+        index = self._search_index
+        return index if index is not None else self.build_search_index()
+    
+    def build_search_index(self) -> TaskSearchIndex:
+        # Under the store lock no change is journaled, and so indexed, mid-build;
+        # changes made after the snapshot update the index once it is in place
+        with self.store_lock:
+            if self._search_index is None:
+                index = TaskSearchIndex()
+                index.update(self.snapshot())
+                self._search_index = index
+            return self._search_index
+    
+    def start_catch_up(self):
+        """Deliver missed reminders on a background thread once loaded and started"""
+        with self.lock.write():
+            if not (self.started and self.loaded.is_set()):
+                return
+            missed, self.missed = self.missed, []
+        if missed:
+            threading.Thread(target=self.catch_up, args=(missed,), daemon=True).start()
+        else:
+            self.caught_up.set()
+    
+    def catch_up(self, missed, now=None):
+        """Deliver overdue reminders in batches according to catchup_policy
+
+        'fire-all' sends each reminder on its own, 'digest' collapses them
+        into one notification per recipient, and 'skip' marks reminders more
+        than catchup_max_age hours late as done without notifying and sends
+        the rest on their own. Lateness is recorded for every task.
+        """
+        now = now or datetime.now()
+        policy = self.catchup_policy
+        cutoff = now - timedelta(hours=self.catchup_max_age) if policy == 'skip' else None
+        report = []
+        
+        for start in range(0, len(missed), self.catchup_batch_size):
+            fired = []
+            notices = []
+            with self.lock.write():
+                for task in missed[start:start + self.catchup_batch_size]:
+                    # Skip tasks completed or deleted since the load
+                    if self.tasks.get(task.id) is not task or not task.is_active or task.is_completed:
+                        continue
+                    lateness = (now - task.reminder_time).total_seconds()
+                    skipped = cutoff is not None and task.reminder_time < cutoff
+                    notice = replace(task) if task.recurrence else task
+                    if task.recurrence:
+                        self.advance_recurrence(task, now)
+                    else:
+                        task.is_completed = True
+                    fired.append(task)
+                    if not skipped:
+                        notices.append(notice)
+                    report.append({'id': task.id, 'title': task.title,
+                                   'due': notice.reminder_time.isoformat(),
+                                   'lateness': lateness, 'action': 'skipped' if skipped else 'notified'})
+                    METRICS.observe('reminder_catchup_lateness_seconds', lateness)
+            
+            # Deliver and persist each batch outside the lock
+            for notice in notices:
+                if policy == 'digest':
+                    self.send_notification(notice)
+                else:
+                    # Block rather than dead-letter when the queues are full
+                    for channel, recipient in self.notification_targets(notice):
+                        self.dispatcher.submit(channel, [notice], timeout=None)
+            self.persist_tasks(fired)
+        
+        if policy == 'digest':
+            self.coalescer.flush()
+        
+        skipped = sum(entry['action'] == 'skipped' for entry in report)
+        METRICS.inc('reminders_missed_total', len(report))
+        METRICS.inc('reminders_skipped_total', skipped)
+        self.last_catch_up = report
+        if report:
+            latest = max(entry['lateness'] for entry in report)
+            print(f"Caught up on {len(report)} missed reminder(s) ({policy}): "
+                  f"{len(report) - skipped} delivered, {skipped} skipped, up to {latest / 3600:.1f}h late")
+        self.caught_up.set()
+    
+    def save_email_settings(self):
+        """Save email settings to file for persistence"""
+        try:
+            settings = {
+                'smtp_server': self.smtp_server,
+                'smtp_port': self.smtp_port,
+                'email_username': self.email_username,
+                'email_password': self.email_password,
+                'coalesce_window': self.coalesce_window,
+                'catchup_policy': self.catchup_policy,
+                'catchup_max_age': self.catchup_max_age
+            }
+            
+            with open(self.settings_file, 'w') as f:
+                json.dump(settings, f, indent=2)
+                
+        except Exception as e:
+            print(f"Error saving email settings: {str(e)}")
+    
+    def load_email_settings(self):
+        """Load email settings from file"""
+        try:
+            if os.path.exists(self.settings_file):
+                with open(self.settings_file, 'r') as f:
+                    settings = json.load(f)
+                
+                self.smtp_server = settings.get('smtp_server', 'smtp.gmail.com')
+                self.smtp_port = settings.get('smtp_port', 587)
+                self.email_username = settings.get('email_username', '')
+                self.email_password = settings.get('email_password', '')
+                self.coalesce_window = float(settings.get('coalesce_window', 0.0))
+                policy = settings.get('catchup_policy', 'digest')
+                self.catchup_policy = policy if policy in CATCHUP_POLICIES else 'digest'
+                self.catchup_max_age = float(settings.get('catchup_max_age', 24.0))
+                    
+        except Exception as e:
+            print(f"Error loading email settings: {str(e)}")
+
+# Sharding
+def run_shard(shard_id, data_dir, storage, requests, responses, metrics_enabled=True):
+    """Worker process: owns one shard's store, due index and scheduler"""
+    # The coordinator decides when to shut down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # A spawned worker starts with a fresh registry, so --no-metrics is passed in
+    METRICS.enabled = metrics_enabled
+    engine = ReminderEngine(
+        storage=storage,
+        data_file=os.path.join(data_dir, f"tasks.shard{shard_id}.json"),
+        settings_file=os.path.join(data_dir, "email_settings.json")
+    )
+    engine.start()
+    
+    def add(entries):
+        return [task.id for task in engine.add_tasks(entries)]
+    
+    def complete(task_ids):
+        tasks = engine.get_tasks(task_ids)
+        engine.complete_tasks(tasks)
+        return len(tasks)
+    
+    def delete(task_ids):
+        tasks = engine.get_tasks(task_ids)
+        engine.delete_tasks(tasks)
+        return len(tasks)
+    
+    def get(task_ids):
+        return [task_to_dict(task) for task in engine.get_tasks(task_ids)]
+    
+    def metrics(_):
+        with engine.lock.read():
+            count = len(engine.tasks)
+            pending = len(engine.due_index)
+        next_due = engine.next_due()
+        return {
+            'shard': shard_id,
+            'pid': os.getpid(),
+            'tasks': count,
+            'pending': pending,
+            'next_due': next_due.isoformat() if next_due else None,
+            'dispatch': engine.dispatcher.metrics(),
+            'metrics': METRICS.snapshot()
+        }
+    
+    handlers = {'add': add, 'complete': complete, 'delete': delete, 'get': get, 'metrics': metrics}
+    while True:
+        # Replies echo the request's sequence number so the coordinator can drop stale ones
+        sequence, op, args = requests.get()
+        if op == 'stop':
+            break
+        try:
+            responses.put((sequence, True, handlers[op](args)))
+        except Exception as e:
+            responses.put((sequence, False, str(e)))
+    
+    engine.stop()
+    responses.put((sequence, True, None))
+
+class ShardedReminderEngine:
+    """Partitions tasks by owner across ReminderEngine worker processes"""
+    def __init__(self, shard_count=4, data_dir=".", storage="json", timeout=60.0):
+        self.shard_count = shard_count
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.partition_store(data_dir, storage)
+        
+        # Spawn rather than fork: the coordinator may already be running threads
+        context = multiprocessing.get_context("spawn")
+        self.requests = [context.Queue() for _ in range(shard_count)]
+        self.responses = [context.Queue() for _ in range(shard_count)]
+        self.workers = [
+            context.Process(
+                target=run_shard,
+                args=(shard, data_dir, storage, self.requests[shard], self.responses[shard], METRICS.enabled),
+                name=f"reminder-shard-{shard}",
+                daemon=True
+            )
+            for shard in range(shard_count)
+        ]
+        for worker in self.workers:
+            worker.start()
+        # The coordinator records nothing itself; /metrics reads the workers' registries
+        METRICS.add_collector(self.collect_metrics)
+    
+    def shard_for(self, email="", phone="", title="") -> int:
+        """Stable shard for a task owner, keyed by email, then phone, then title"""
+        key = (email or phone or title).strip().lower()
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') % self.shard_count
+    
+    def partition_store(self, data_dir, storage):
+        """Split an existing single-engine tasks.json (or tasks.db) into the shard files once"""
+        json_path = os.path.join(data_dir, "tasks.json")
+        db_path = os.path.join(data_dir, "tasks.db")
+        if os.path.exists(json_path) or os.path.exists(json_path + ".journal"):
+            source = JournalTaskStore(json_path)
+            paths = [json_path, json_path + ".journal", json_path + ".meta"]
+        elif storage == "sqlite" and os.path.exists(db_path):
+            source = SQLiteTaskStore(db_path)
+            paths = [db_path, db_path + "-wal", db_path + "-shm"]
+        else:
+            return
+        
+        shard_paths = [os.path.join(data_dir, f"tasks.shard{shard}{suffix}")
+                       for shard in range(self.shard_count) for suffix in (".json", ".json.journal", ".db")]
+        if any(os.path.exists(path) for path in shard_paths):
+            source.close()
+            raise RuntimeError(f"{source.path} and shard files both exist in {os.path.abspath(data_dir)}; "
+                               f"move one aside before starting with --shards")
+        
+        # Tasks keep their ids; each shard's counter resumes from its own highest id.
+        # SQLite loads only active tasks, so completed history stays in tasks.db.migrated
+        shards = [[] for _ in range(self.shard_count)]
+        for task_data in source.load():
+            task = task_from_dict(task_data)
+            shards[self.shard_for(task.email, task.phone, task.title)].append(task)
+        source.close()
+        for shard, tasks in enumerate(shards):
+            if storage == "sqlite":
+                store = SQLiteTaskStore(os.path.join(data_dir, f"tasks.shard{shard}.db"))
+            else:
+                store = JournalTaskStore(os.path.join(data_dir, f"tasks.shard{shard}.json"))
+            store.compact(tasks)
+            pending = [task.reminder_time for task in tasks if task.is_active and not task.is_completed]
+            store.save_header(max((int(task.id) for task in tasks), default=None),
+                              min(pending) if pending else None)
+            store.close()
+        
+        for path in paths:
+            if os.path.exists(path):
+                os.replace(path, path + ".migrated")
+        print(f"Partitioned {sum(map(len, shards))} tasks from {source.path} into {self.shard_count} shards")
+    
+    def split_id(self, global_id):
+        """Split a "shard:id" task id into its shard number and local id"""
+        shard, task_id = global_id.split(":", 1)
+        shard = int(shard)
+        if not 0 <= shard < self.shard_count:
+            raise ValueError(f"Unknown shard in task id {global_id!r}")
+        return shard, task_id
+    
+    def _call(self, requests):
+        """Send {shard: (op, args)} to every shard before waiting, so shards work in parallel"""
+        results = {}
+        errors = []
+        with self.lock:
+            self.sequence += 1
+            for shard, (op, args) in requests.items():
+                self.requests[shard].put((self.sequence, op, args))
+            for shard in requests:
+                try:
+                    ok, result = self._receive(shard, self.sequence)
+                except queue.Empty:
+                    ok, result = False, "no response"
+                if ok:
+                    results[shard] = result
+                else:
+                    errors.append(f"shard {shard}: {result}")
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return results
+    
+    def _receive(self, shard, sequence):
+        """Wait for shard's reply to request sequence, dropping late replies to timed-out requests"""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            reply, ok, result = self.responses[shard].get(timeout=max(0.0, deadline - time.monotonic()))
+            if reply == sequence:
+                return ok, result
+            print(f"Dropped late reply from shard {shard} to request {reply}")
+    
+    def _group(self, global_ids):
+        groups = {}
+        for global_id in global_ids:
+            shard, task_id = self.split_id(global_id)
+            groups.setdefault(shard, []).append(task_id)
+        return groups
+    
+    def add_task(self, title, description, reminder_time, email="", phone="", recurrence="") -> str:
+        return self.add_tasks([(title, description, reminder_time, email, phone, recurrence)])[0]
+    
+    def add_tasks(self, entries) -> List[str]:
+        """Add (title, description, reminder_time, email, phone, recurrence) tuples; returns ids in order"""
+        batches = {}
+        positions = {}
+        for position, entry in enumerate(entries):
+            shard = self.shard_for(entry[3], entry[4], entry[0])
+            batches.setdefault(shard, []).append(entry)
+            positions.setdefault(shard, []).append(position)
+        
+        ids = [None] * len(entries)
+        results = self._call({shard: ('add', batch) for shard, batch in batches.items()})
+        for shard, task_ids in results.items():
+            for position, task_id in zip(positions[shard], task_ids):
+                ids[position] = f"{shard}:{task_id}"
+        return ids
+    
+    def complete_tasks(self, global_ids) -> int:
+        results = self._call({shard: ('complete', ids) for shard, ids in self._group(global_ids).items()})
+        return sum(results.values())
+    
+    def delete_tasks(self, global_ids) -> int:
+        results = self._call({shard: ('delete', ids) for shard, ids in self._group(global_ids).items()})
+        return sum(results.values())
+    
+    def get_tasks(self, global_ids) -> List[dict]:
+        """Task dicts for the given ids, with ids in "shard:id" form"""
+        results = self._call({shard: ('get', ids) for shard, ids in self._group(global_ids).items()})
+        tasks = []
+        for shard, task_dicts in results.items():
+            for task_data in task_dicts:
+                task_data['id'] = f"{shard}:{task_data['id']}"
+                tasks.append(task_data)
+        return tasks
+    
+    def metrics(self) -> dict:
+        """Per-shard metrics plus totals across the pool"""
+        results = self._call({shard: ('metrics', None) for shard in range(self.shard_count)})
+        shards = [results[shard] for shard in range(self.shard_count)]
+        due = [shard['next_due'] for shard in shards if shard['next_due']]
+        return {
+            'shards': shards,
+            'tasks': sum(shard['tasks'] for shard in shards),
+            'pending': sum(shard['pending'] for shard in shards),
+            'next_due': min(due) if due else None
+        }
+    
+    def collect_metrics(self) -> dict:
+        """Every shard's registry: counters and histograms summed, gauges labelled by shard"""
+        merged = {'counters': {}, 'gauges': {}, 'histograms': {}}
+        for shard in self.metrics()['shards']:
+            snapshot = shard['metrics']
+            snapshot['gauges'] = {metric_key(name, shard=shard['shard']): value
+                                  for name, value in snapshot['gauges'].items()}
+            MetricsRegistry.merge(merged, snapshot)
+        return merged
+    
+    def stop(self):
+        METRICS.remove_collector(self.collect_metrics)
+        with self.lock:
+            self.sequence += 1
+            for requests in self.requests:
+                requests.put((self.sequence, 'stop', None))
+            for shard, worker in enumerate(self.workers):
+                try:
+                    self._receive(shard, self.sequence)
+                except queue.Empty:
+                    print(f"Error stopping shard {shard}: no response")
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+
+class TaskListView:
+    """Paged Treeview of active tasks, updated by diffing rows keyed on Task.id"""
+    def __init__(self, tree, page_size=200):
+        self.tree = tree
+        self.page_size = page_size
+        self.page = 0
+        self.total = 0
+        self.rows = {}
+        self.order = []
+        
+    @staticmethod
+    def row_values(task):
+        if task.is_completed:
+            status = "Completed"
+        else:
+            status = "Repeating" if task.recurrence else "Pending"
+        return (
+            task.title,
+            task.description[:50] + "..." if len(task.description) > 50 else task.description,
+            task.reminder_time.strftime("%Y-%m-%d %H:%M"),
+            status
+        )
+    
+    @property
+    def page_count(self):
+        return max(1, -(-self.total // self.page_size))
+    
+    def render(self, tasks):
+        """Bring the visible page in line with tasks, touching only rows that changed"""
+        active = [task for task in tasks if task.is_active]
+        self.total = len(active)
+        self.page = min(self.page, self.page_count - 1)
+        start = self.page * self.page_size
+        self._show(active[start:start + self.page_size])
+    
+    def render_ids(self, fetch, tasks):
+        """Render the visible page of an ordered result; fetch(offset, limit) returns (total, ids)"""
+        self.total, task_ids = fetch(self.page * self.page_size, self.page_size)
+        if self.page >= self.page_count:
+            # Rows were removed since this page was shown
+            self.page = self.page_count - 1
+            self.total, task_ids = fetch(self.page * self.page_size, self.page_size)
+        window = [tasks.get(task_id) for task_id in task_ids]
+        self._show([task for task in window if task is not None])
+    
+    def _show(self, window):
+        desired = {task.id: self.row_values(task) for task in window}
+        stale = [iid for iid in self.order if iid not in desired]
+        if stale:
+            self.tree.delete(*stale)
+        
+        for index, task in enumerate(window):
+            values = desired[task.id]
+            current = self.rows.get(task.id)
+            if current is None:
+                self.tree.insert("", index, iid=task.id, values=values)
+            elif current != values:
+                self.tree.item(task.id, values=values)
+        
+        order = [task.id for task in window]
+        if list(self.tree.get_children()) != order:
+            for index, iid in enumerate(order):
+                self.tree.move(iid, "", index)
+        
+        self.rows = desired
+        self.order = order
+    
+    def next_page(self):
+        self.page = min(self.page + 1, self.page_count - 1)
+    
+    def previous_page(self):
+        self.page = max(self.page - 1, 0)
 
 class TaskReminderSystem:
-    def __init__(self):
+    # How often the Tk thread drains work queued by background threads
+    UI_POLL_MS = 100
+    
+    def __init__(self, storage="json"):
+        if tk is None:
+            raise RuntimeError("Tkinter is not available; run with --headless instead")
+        
         self.root = tk.Tk()
         self.root.title("Personal Task Reminder System")
         self.root.geometry("800x600")
         self.root.configure(bg="#f0f0f0")
         
-        # Task storage
-        self.tasks = []
-        self.task_counter = 0
-        self.data_file = "tasks.json"
-        
-        # Email configuration
-        self.smtp_server = "smtp.gmail.com"
-        self.smtp_port = 587
-        self.email_username = ""
-        self.email_password = ""
-        
-        # Load existing data
-        self.load_email_settings()
-        self.load_tasks()
+        # Tk is single-threaded: engine threads queue UI work here instead of calling Tk
+        self.ui_events = queue.Queue()
+        self.engine = ReminderEngine(storage=storage, desktop_notifier=self.queue_notification,
+                                     background_load=True,
+                                     on_loaded=self.tasks_loaded)
         
         # Create GUI
         self.create_widgets()
+        self.root.after(self.UI_POLL_MS, self.drain_ui_events)
         
-        # Start reminder checker thread
-        self.reminder_thread = threading.Thread(target=self.check_reminders, daemon=True)
-        self.reminder_thread.start()
-        
-        # Schedule periodic checks
-        schedule.every(1).minutes.do(self.process_reminders)
+        # Start notification workers and the reminder scheduler thread
+        self.engine.start()
         
     def create_widgets(self):
         # Main frame
@@ -111,31 +2923,69 @@ class TaskReminderSystem:
         self.phone_entry = ttk.Entry(input_frame, width=30)
         self.phone_entry.grid(row=5, column=1, sticky=(tk.W, tk.E), padx=(0, 10), pady=(5, 0))
         
+        # Recurrence: a preset or a custom RRULE
+        ttk.Label(input_frame, text="Repeat:").grid(row=6, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        self.repeat_entry = ttk.Combobox(input_frame, width=28,
+                                         values=("None", "Daily", "Weekdays", "Weekly", "Monthly"))
+        self.repeat_entry.grid(row=6, column=1, sticky=tk.W, padx=(0, 10), pady=(5, 0))
+        self.repeat_entry.set("None")
+        
         # Add task button
         add_button = ttk.Button(input_frame, text="Add Task", command=self.add_task)
-        add_button.grid(row=6, column=1, sticky=tk.E, pady=(10, 0))
+        add_button.grid(row=7, column=1, sticky=tk.E, pady=(10, 0))
         
         # Tasks list section
         list_frame = ttk.LabelFrame(main_frame, text="Your Tasks", padding="10")
         list_frame.grid(row=2, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(0, 10))
         list_frame.columnconfigure(0, weight=1)
-        list_frame.rowconfigure(0, weight=1)
+        list_frame.rowconfigure(1, weight=1)
         main_frame.rowconfigure(2, weight=1)
         
+        # Search and due-date filter
+        search_frame = ttk.Frame(list_frame)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        search_frame.columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="Search:").grid(row=0, column=0, padx=(0, 5))
+        self.search_entry = ttk.Entry(search_frame)
+        self.search_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), padx=(0, 10))
+        self.search_entry.bind("<KeyRelease>", lambda event: self.schedule_search())
+        ttk.Label(search_frame, text="Due:").grid(row=0, column=2, padx=(0, 5))
+        self.due_filter = ttk.Combobox(search_frame, width=12, state="readonly", values=DUE_WINDOWS)
+        self.due_filter.grid(row=0, column=3)
+        self.due_filter.set(DUE_WINDOWS[0])
+        self.due_filter.bind("<<ComboboxSelected>>", lambda event: self.run_search())
+        self.search_job = None
+        self.sort_by = None
+        self.sort_descending = False
+        
         # Treeview for tasks
         columns = ("Title", "Description", "Reminder Time", "Status")
         self.task_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=10)
         
+        sort_columns = {"Title": 'title', "Reminder Time": 'reminder_time', "Status": 'status'}
         for col in columns:
-            self.task_tree.heading(col, text=col)
+            if col in sort_columns:
+                self.task_tree.heading(col, text=col,
+                                       command=lambda column=sort_columns[col]: self.sort_tasks(column))
+            else:
+                self.task_tree.heading(col, text=col)
             self.task_tree.column(col, width=150)
         
         # Scrollbar for treeview
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.task_tree.yview)
         self.task_tree.configure(yscrollcommand=scrollbar.set)
         
-        self.task_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.task_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.task_view = TaskListView(self.task_tree)
+        
+        # Pager for the task list
+        pager_frame = ttk.Frame(list_frame)
+        pager_frame.grid(row=2, column=0, columnspan=2, pady=(5, 0))
+        ttk.Button(pager_frame, text="< Prev", command=self.previous_page).grid(row=0, column=0, padx=(0, 5))
+        self.page_label = ttk.Label(pager_frame, text="")
+        self.page_label.grid(row=0, column=1, padx=5)
+        ttk.Button(pager_frame, text="Next >", command=self.next_page).grid(row=0, column=2, padx=(5, 0))
         
         # Buttons frame
         button_frame = ttk.Frame(main_frame)
@@ -163,105 +3013,107 @@ class TaskReminderSystem:
             email = self.email_entry.get().strip()
             phone = self.phone_entry.get().strip()
             
-            if not title:
-                messagebox.showerror("Error", "Please enter a task title")
-                return
-                
-            if not date_str or not time_str:
-                messagebox.showerror("Error", "Please enter both date and time")
-                return
-            
-            # Parse datetime
-            reminder_datetime = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
-            
-            if reminder_datetime <= datetime.now():
-                messagebox.showerror("Error", "Reminder time must be in the future")
-                return
-            
-            # Create task
-            task = Task(
-                id=str(self.task_counter),
-                title=title,
-                description=description,
-                reminder_time=reminder_datetime,
-                email=email,
-                phone=phone
-            )
-            
-            self.tasks.append(task)
-            self.task_counter += 1
+            reminder_datetime = validate_task_input(title, date_str, time_str)
+            recurrence = parse_recurrence(self.repeat_entry.get())
+            self.engine.add_task(title, description, reminder_datetime, email, phone, recurrence)
             
             # Clear entries
             self.title_entry.delete(0, tk.END)
             self.desc_entry.delete("1.0", tk.END)
             self.email_entry.delete(0, tk.END)
             self.phone_entry.delete(0, tk.END)
+            self.repeat_entry.set("None")
             
-            # Save and refresh
-            self.save_tasks()
+            # Refresh
             self.refresh_tasks()
             
             messagebox.showinfo("Success", f"Task '{title}' added successfully!")
             
         except ValueError as e:
-            messagebox.showerror("Error", "Please enter valid date (YYYY-MM-DD) and time (HH:MM)")
+            messagebox.showerror("Error", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
     
+    def selected_tasks(self):
+        # Treeview rows use Task.id as their iid
+        return self.engine.get_tasks(self.task_tree.selection())
+    
     def complete_task(self):
-        selected = self.task_tree.selection()
-        if not selected:
+        tasks = [task for task in self.selected_tasks() if task.is_active]
+        if not tasks:
             messagebox.showwarning("Warning", "Please select a task to complete")
             return
         
-        item = self.task_tree.item(selected[0])
-        task_title = item['values'][0]
-        
-        for task in self.tasks:
-            if task.title == task_title and task.is_active:
-                task.is_completed = True
-                task.is_active = False
-                break
-        
-        self.save_tasks()
+        self.engine.complete_tasks(tasks)
         self.refresh_tasks()
-        messagebox.showinfo("Success", f"Task '{task_title}' marked as completed!")
+        
+        if len(tasks) == 1:
+            messagebox.showinfo("Success", f"Task '{tasks[0].title}' marked as completed!")
+        else:
+            messagebox.showinfo("Success", f"{len(tasks)} tasks marked as completed!")
     
     def delete_task(self):
-        selected = self.task_tree.selection()
-        if not selected:
+        tasks = self.selected_tasks()
+        if not tasks:
             messagebox.showwarning("Warning", "Please select a task to delete")
             return
         
-        item = self.task_tree.item(selected[0])
-        task_title = item['values'][0]
-        
-        if messagebox.askyesno("Confirm", f"Are you sure you want to delete '{task_title}'?"):
-            self.tasks = [task for task in self.tasks if not (task.title == task_title and task.is_active)]
-            self.save_tasks()
+        label = f"'{tasks[0].title}'" if len(tasks) == 1 else f"{len(tasks)} tasks"
+        if messagebox.askyesno("Confirm", f"Are you sure you want to delete {label}?"):
+            self.engine.delete_tasks(tasks)
             self.refresh_tasks()
-            messagebox.showinfo("Success", f"Task '{task_title}' deleted!")
+            messagebox.showinfo("Success", f"Task {label} deleted!" if len(tasks) == 1 else f"{label} deleted!")
     
     def refresh_tasks(self):
-        # Clear existing items
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-        
-        # Add active tasks
-        for task in self.tasks:
-            if task.is_active:
-                status = "Completed" if task.is_completed else "Pending"
-                self.task_tree.insert("", tk.END, values=(
-                    task.title,
-                    task.description[:50] + "..." if len(task.description) > 50 else task.description,
-                    task.reminder_time.strftime("%Y-%m-%d %H:%M"),
-                    status
-                ))
+        text = self.search_entry.get().strip()
+        start, end = due_window(self.due_filter.get())
+        with METRICS.timer('task_list_render_seconds'):
+            if text or start or end or self.sort_by:
+                fetch = lambda offset, limit: self.engine.search_index.search_page(
+                    text, start, end,
+                    sort_by=self.sort_by or 'reminder_time',
+                    descending=self.sort_descending,
+                    offset=offset, limit=limit
+                )
+                self.task_view.render_ids(fetch, self.engine.tasks)
+            else:
+                self.task_view.render(self.engine.snapshot())
+        view = self.task_view
+        self.page_label.configure(text=f"Page {view.page + 1} of {view.page_count} ({view.total} tasks)")
+    
+    def schedule_search(self):
+        # Re-query once typing pauses rather than on every keystroke
+        if self.search_job is not None:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(150, self.run_search)
+    
+    def run_search(self):
+        self.search_job = None
+        self.task_view.page = 0
+        self.refresh_tasks()
+    
+    def sort_tasks(self, column):
+        """Sort by a column heading; clicking the same heading again reverses the order"""
+        if self.sort_by == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_by = column
+            self.sort_descending = False
+        self.task_view.page = 0
+        self.refresh_tasks()
+    
+    def next_page(self):
+        self.task_view.next_page()
+        self.refresh_tasks()
+    
+    def previous_page(self):
+        self.task_view.previous_page()
+        self.refresh_tasks()
     
     def open_settings(self):
         settings_window = tk.Toplevel(self.root)
         settings_window.title("Email Settings")
-        settings_window.geometry("450x400")
+        settings_window.geometry("450x540")
         settings_window.configure(bg="#f0f0f0")
         
         # Make window modal
@@ -277,25 +3129,43 @@ class TaskReminderSystem:
         ttk.Label(frame, text="SMTP Server:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(5, 0))
         smtp_entry = ttk.Entry(frame, width=40, font=("Arial", 10))
         smtp_entry.pack(fill=tk.X, pady=(0, 10))
-        smtp_entry.insert(0, self.smtp_server)
+        smtp_entry.insert(0, self.engine.smtp_server)
         
         # SMTP Port
         ttk.Label(frame, text="SMTP Port:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(5, 0))
         port_entry = ttk.Entry(frame, width=40, font=("Arial", 10))
         port_entry.pack(fill=tk.X, pady=(0, 10))
-        port_entry.insert(0, str(self.smtp_port))
+        port_entry.insert(0, str(self.engine.smtp_port))
         
         # Email Username
         ttk.Label(frame, text="Email Username:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(5, 0))
         username_entry = ttk.Entry(frame, width=40, font=("Arial", 10))
         username_entry.pack(fill=tk.X, pady=(0, 10))
-        username_entry.insert(0, self.email_username)
+        username_entry.insert(0, self.engine.email_username)
         
         # Email Password
         ttk.Label(frame, text="Email Password (App Password):", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(5, 0))
         password_entry = ttk.Entry(frame, width=40, show="*", font=("Arial", 10))
         password_entry.pack(fill=tk.X, pady=(0, 15))
-        password_entry.insert(0, self.email_password)
+        password_entry.insert(0, self.engine.email_password)
+        
+        # Digest window
+        ttk.Label(frame, text="Digest Window (seconds, 0 = per check):", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(5, 0))
+        window_entry = ttk.Entry(frame, width=40, font=("Arial", 10))
+        window_entry.pack(fill=tk.X, pady=(0, 15))
+        window_entry.insert(0, str(self.engine.coalesce_window))
+        
+        # Reminders missed while the app was closed
+        ttk.Label(frame, text="Missed Reminders on Startup:", font=("Arial", 10, "bold")).pack(anchor=tk.W, pady=(5, 0))
+        catchup_frame = ttk.Frame(frame)
+        catchup_frame.pack(fill=tk.X, pady=(0, 15))
+        catchup_entry = ttk.Combobox(catchup_frame, width=10, state="readonly", values=CATCHUP_POLICIES)
+        catchup_entry.pack(side=tk.LEFT)
+        catchup_entry.set(self.engine.catchup_policy)
+        ttk.Label(catchup_frame, text="skip if older than (hours):").pack(side=tk.LEFT, padx=(10, 5))
+        max_age_entry = ttk.Entry(catchup_frame, width=8, font=("Arial", 10))
+        max_age_entry.pack(side=tk.LEFT)
+        max_age_entry.insert(0, str(self.engine.catchup_max_age))
         
         # Instructions
         instructions = ttk.Label(frame, text="For Gmail: Use App Password (not regular password)\nSMTP: smtp.gmail.com, Port: 587", 
@@ -308,14 +3178,19 @@ class TaskReminderSystem:
         
         def save_settings():
             try:
-                self.smtp_server = smtp_entry.get().strip()
+                self.engine.smtp_server = smtp_entry.get().strip()
                 port_text = port_entry.get().strip()
-                self.smtp_port = int(port_text) if port_text.isdigit() else 587
-                self.email_username = username_entry.get().strip()
-                self.email_password = password_entry.get().strip()
+                self.engine.smtp_port = int(port_text) if port_text.isdigit() else 587
+                self.engine.email_username = username_entry.get().strip()
+                self.engine.email_password = password_entry.get().strip()
+                self.engine.coalesce_window = max(0.0, float(window_entry.get().strip() or 0))
+                self.engine.coalescer.window = self.engine.coalesce_window
+                self.engine.catchup_policy = catchup_entry.get()
+                self.engine.catchup_max_age = max(0.0, float(max_age_entry.get().strip() or 24))
                 
                 # Save to file for persistence
-                self.save_email_settings()
+                self.engine.save_email_settings()
+                self.engine.reset_mail_pool()
                 
                 messagebox.showinfo("Success", "Email settings saved successfully!")
                 settings_window.destroy()
@@ -337,150 +3212,108 @@ class TaskReminderSystem:
         ttk.Button(button_frame, text="Save Settings", command=save_settings).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(button_frame, text="Cancel", command=settings_window.destroy).pack(side=tk.LEFT)
     
-    def check_reminders(self):
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+    def tasks_loaded(self):
+        # Runs on the loader thread; building the search index here keeps it off the first keystroke
+        self.post_ui(self.refresh_tasks)
+        self.engine.build_search_index()
     
-    def process_reminders(self):
-        current_time = datetime.now()
-        
-        for task in self.tasks:
-            if (task.is_active and not task.is_completed and 
-                task.reminder_time <= current_time):
-                
-                self.send_notification(task)
-                # Mark as completed to avoid repeated notifications
-                task.is_completed = True
-                self.save_tasks()
+    def post_ui(self, func, *args):
+        """Run func(*args) on the Tk thread; safe to call from any thread"""
+        self.ui_events.put((func, args))
     
-    def send_notification(self, task):
-        # Desktop notification
-        messagebox.showinfo("Task Reminder", 
-                          f"Reminder: {task.title}\n\n{task.description}")
-        
-        # Email notification
-        if task.email and self.email_username and self.email_password:
-            self.send_email(task)
-        
-        # SMS would require additional services like Twilio
-        # For now, we'll just show the phone number in console
-        if task.phone:
-            print(f"SMS Reminder to {task.phone}: {task.title}")
+    def queue_notification(self, tasks):
+        # Called on a dispatcher thread; fired tasks changed state, so refresh too
+        self.post_ui(self.refresh_tasks)
+        self.post_ui(self.show_desktop_notification, tasks)
     
-    def send_email(self, task):
+    def drain_ui_events(self):
+        events = []
         try:
-            msg = MIMEMultipart()
-            msg['From'] = self.email_username
-            msg['To'] = task.email
-            msg['Subject'] = f"Task Reminder: {task.title}"
-            
-            body = f"""
-            Hello!
-            
-            This is a reminder for your task:
-            
-            Title: {task.title}
-            Description: {task.description}
-            Scheduled Time: {task.reminder_time.strftime('%Y-%m-%d %H:%M')}
-            
-            Best regards,
-            Personal Task Reminder System
-            """
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-            server.starttls()
-            server.login(self.email_username, self.email_password)
-            text = msg.as_string()
-            server.sendmail(self.email_username, task.email, text)
-            server.quit()
-            
-            print(f"Email sent successfully to {task.email}")
-            
-        except Exception as e:
-            print(f"Failed to send email: {str(e)}")
-    
-    def save_tasks(self):
+            while True:
+                events.append(self.ui_events.get_nowait())
+        except queue.Empty:
+            pass
+        
         try:
-            tasks_data = []
-            for task in self.tasks:
-                tasks_data.append({
-                    'id': task.id,
-                    'title': task.title,
-                    'description': task.description,
-                    'reminder_time': task.reminder_time.isoformat(),
-                    'email': task.email,
-                    'phone': task.phone,
-                    'is_completed': task.is_completed,
-                    'is_active': task.is_active
-                })
-            
-            with open(self.data_file, 'w') as f:
-                json.dump(tasks_data, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error saving tasks: {str(e)}")
+            # Collapse queued refreshes into one before showing any popups
+            if any(func == self.refresh_tasks for func, _ in events):
+                events = [(self.refresh_tasks, ())] + [(func, args) for func, args in events
+                                                       if func != self.refresh_tasks]
+            for func, args in events:
+                try:
+                    func(*args)
+                except Exception as e:
+                    print(f"Error handling UI event: {str(e)}")
+        finally:
+            # Re-arm even if an event escapes, or every later event is lost
+            self.root.after(self.UI_POLL_MS, self.drain_ui_events)
     
-    def load_tasks(self):
-        try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r') as f:
-                    tasks_data = json.load(f)
-                
-                for task_data in tasks_data:
-                    task = Task(
-                        id=task_data['id'],
-                        title=task_data['title'],
-                        description=task_data['description'],
-                        reminder_time=datetime.fromisoformat(task_data['reminder_time']),
-                        email=task_data['email'],
-                        phone=task_data['phone'],
-                        is_completed=task_data.get('is_completed', False),
-                        is_active=task_data.get('is_active', True)
-                    )
-                    self.tasks.append(task)
-                
-                if self.tasks:
-                    self.task_counter = max(int(task.id) for task in self.tasks) + 1
-                    
-        except Exception as e:
-            print(f"Error loading tasks: {str(e)}")
+    def show_desktop_notification(self, tasks):
+        if len(tasks) == 1:
+            task = tasks[0]
+            messagebox.showinfo("Task Reminder", 
+                              f"Reminder: {task.title}\n\n{task.description}")
+            return
+        
+        # One popup for the whole burst instead of one modal per task
+        lines = [f"- {task.title}" for task in tasks[:20]]
+        if len(tasks) > 20:
+            lines.append(f"... and {len(tasks) - 20} more")
+        messagebox.showinfo("Task Reminders", f"{len(tasks)} tasks are due:\n\n" + "\n".join(lines))
     
-    def save_email_settings(self):
-        """Save email settings to file for persistence"""
+    def run(self):
+        self.root.mainloop()
+        self.engine.stop()
+
+def run_transfer(storage, import_path=None, export_path=None, fmt=None):
+    """Command-line bulk import/export that reports throughput"""
+    engine = ReminderEngine(storage=storage)
+    try:
+        if import_path:
+            start = time.perf_counter()
+            imported, errors = engine.import_tasks(import_path, fmt)
+            elapsed = time.perf_counter() - start
+            for line_number, message in errors[:10]:
+                print(f"Row {line_number}: {message}")
+            if len(errors) > 10:
+                print(f"... and {len(errors) - 10} more rejected rows")
+            print(f"Imported {len(imported)} tasks ({len(errors)} rejected) in {elapsed:.2f}s, "
+                  f"{len(imported) / max(elapsed, 1e-9):.0f} tasks/sec")
+        
+        if export_path:
+            start = time.perf_counter()
+            count = engine.export_tasks(export_path, fmt)
+            elapsed = time.perf_counter() - start
+            print(f"Exported {count} tasks in {elapsed:.2f}s, {count / max(elapsed, 1e-9):.0f} tasks/sec")
+    except OSError as e:
+        print(f"Error transferring tasks: {str(e)}")
+    finally:
+        engine.stop()
+
+def run_daemon(storage="json", shards=1):
+    """Run the reminder engine without a GUI until interrupted"""
+    if shards > 1:
         try:
-            settings = {
-                'smtp_server': self.smtp_server,
-                'smtp_port': self.smtp_port,
-                'email_username': self.email_username,
-                'email_password': self.email_password
-            }
-            
-            with open('email_settings.json', 'w') as f:
-                json.dump(settings, f, indent=2)
-                
-        except Exception as e:
-            print(f"Error saving email settings: {str(e)}")
+            engine = ShardedReminderEngine(shard_count=shards, storage=storage)
+        except RuntimeError as e:
+            print(f"Error starting shards: {str(e)}")
+            return
+        next_due = engine.metrics()['next_due']
+        next_due = datetime.fromisoformat(next_due) if next_due else None
+    else:
+        engine = ReminderEngine(storage=storage, background_load=True)
+        engine.start()
+        next_due = engine.next_due()
+    print(f"Reminder daemon started; next reminder due {next_due.strftime('%Y-%m-%d %H:%M') if next_due else 'never'}")
     
-    def load_email_settings(self):
-        """Load email settings from file"""
-        try:
-            if os.path.exists('email_settings.json'):
-                with open('email_settings.json', 'r') as f:
-                    settings = json.load(f)
-                
-                self.smtp_server = settings.get('smtp_server', 'smtp.gmail.com')
-                self.smtp_port = settings.get('smtp_port', 587)
-                self.email_username = settings.get('email_username', '')
-                self.email_password = settings.get('email_password', '')
-                    
-        except Exception as e:
-            print(f"Error loading email settings: {str(e)}")
+    stopped = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *args: stopped.set())
+    while not stopped.wait(3600):
+        pass
     
-    def run(self):
-        self.root.mainloop()
+    engine.stop()
+    print("Reminder daemon stopped")
 
 def main():
     """
@@ -505,7 +3338,49 @@ def main():
     like Twilio, which requires API keys and additional setup.
     """
     
-    app = TaskReminderSystem()
+    parser = argparse.ArgumentParser(description="Personal Task Reminder System")
+    parser.add_argument("--storage", choices=["json", "sqlite"], default="json",
+                        help="task storage backend (sqlite migrates an existing tasks.json)")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the reminder engine without the GUI")
+    parser.add_argument("--import", dest="import_path", metavar="PATH",
+                        help="bulk-import tasks from a CSV or JSON Lines file and exit")
+    parser.add_argument("--export", dest="export_path", metavar="PATH",
+                        help="export all tasks to a CSV or JSON Lines file and exit")
+    parser.add_argument("--format", choices=["csv", "jsonl"],
+                        help="file format for --import/--export (default: from the extension)")
+    parser.add_argument("--shards", type=int, default=1, metavar="N",
+                        help="with --headless, partition tasks by owner across N worker processes")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-dump", metavar="PATH",
+                        help="write metrics as JSON to PATH on exit")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="switch off metrics collection and timers")
+    args = parser.parse_args()
+    
+    METRICS.enabled = not args.no_metrics
+    if args.metrics_port is not None and METRICS.enabled:
+        port = METRICS.serve(args.metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+    try:
+        run_mode(args)
+    finally:
+        METRICS.shutdown()
+        if args.metrics_dump:
+            METRICS.dump(args.metrics_dump)
+
+def run_mode(args):
+    """Run the transfer, daemon or GUI mode selected on the command line"""
+    if args.import_path or args.export_path:
+        run_transfer(args.storage, args.import_path, args.export_path, args.format)
+        return
+    
+    if args.headless:
+        run_daemon(storage=args.storage, shards=args.shards)
+        return
+    
+    app = TaskReminderSystem(storage=args.storage)
     app.run()
 
 if __name__ == "__main__":